@@ -0,0 +1,250 @@
+"""Baseline schema
+
+Folds in what used to run on every boot (create_all, the information_schema probe for
+submissions.evidence_file_path, the unique-index backfill) and the ad-hoc migrate_*.py
+scripts. Every step checks first, so databases built by the old startup path upgrade cleanly.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return [
+        ("users", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=True),
+            sa.Column("username", sa.String(), nullable=True),
+            sa.Column("password_hash", sa.String(), nullable=False),
+            sa.Column("role", sa.Enum("PARENT", "CHILD", name="roleenum"), nullable=False),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("badges", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("code", sa.String(), nullable=False, unique=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("criteria_type", sa.String(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+        ]),
+        ("tasks", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("category", sa.Enum("FAITH", "SCHOOL", "HOME", "KINDNESS", "OTHER", name="categoryenum"), nullable=False),
+            sa.Column("points", sa.Integer(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("submissions", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id"), nullable=False),
+            sa.Column("status", sa.Enum("PENDING", "APPROVED", "REJECTED", name="submissionstatus"), nullable=True),
+            sa.Column("note", sa.Text(), nullable=True),
+            sa.Column("bible_reference", sa.String(), nullable=True),
+            sa.Column("reflection", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("approved_at", sa.DateTime(), nullable=True),
+            sa.Column("reviewed_by_parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("evidence_file_path", sa.String(), nullable=True),
+        ]),
+        ("submission_evidence", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("submission_id", sa.Integer(), sa.ForeignKey("submissions.id"), nullable=False),
+            sa.Column("file_path", sa.String(), nullable=False),
+            sa.Column("file_type", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        ]),
+        ("points_ledger", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("delta_points", sa.Integer(), nullable=False),
+            sa.Column("reason", sa.String(), nullable=False),
+            sa.Column("related_submission_id", sa.Integer(), sa.ForeignKey("submissions.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("created_by_parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        ]),
+        ("child_balances", [
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("balance", sa.Integer(), nullable=False),
+            sa.Column("lifetime_xp", sa.Integer(), nullable=False),
+            sa.Column("last_ledger_id", sa.Integer(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("child_monthly_points", [
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("month", sa.Date(), primary_key=True),
+            sa.Column("earned", sa.Integer(), nullable=False),
+            sa.Column("spent", sa.Integer(), nullable=False),
+            sa.Column("refunded", sa.Integer(), nullable=False),
+        ]),
+        ("child_stats", [
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("faith_approved", sa.Integer(), nullable=False),
+            sa.Column("school_approved", sa.Integer(), nullable=False),
+            sa.Column("home_approved", sa.Integer(), nullable=False),
+            sa.Column("kindness_approved", sa.Integer(), nullable=False),
+            sa.Column("other_approved", sa.Integer(), nullable=False),
+            sa.Column("faith_days", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("child_faith_days", [
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("day", sa.Date(), primary_key=True),
+        ]),
+        ("parent_settings", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False, unique=True),
+            sa.Column("points_per_dollar", sa.Integer(), nullable=True),
+            sa.Column("monthly_dollar_cap_per_child", sa.Float(), nullable=True),
+            sa.Column("show_money_to_children", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("rewards", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("type", sa.Enum("MONEY", "PRIVILEGE", "GIFT", name="rewardtype"), nullable=False),
+            sa.Column("cost_points", sa.Integer(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        ]),
+        ("reward_redemptions", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("reward_id", sa.Integer(), sa.ForeignKey("rewards.id"), nullable=False),
+            sa.Column("status", sa.Enum("REQUESTED", "APPROVED", "REJECTED", "FULFILLED", name="rewardredemptionstatus"), nullable=True),
+            sa.Column("cost_points_at_time", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("processed_at", sa.DateTime(), nullable=True),
+            sa.Column("processed_by_parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        ]),
+        ("child_badges", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("badge_id", sa.Integer(), sa.ForeignKey("badges.id"), nullable=False),
+            sa.Column("awarded_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("child_id", "badge_id", name="uq_child_badges_child_badge"),
+        ]),
+        ("announcements", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        ]),
+        ("announcement_reads", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("announcement_id", sa.Integer(), sa.ForeignKey("announcements.id"), nullable=False),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("read_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("announcement_id", "child_id", name="uq_announcement_reads_announcement_child"),
+        ]),
+        ("announcement_dismissals", [
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("announcement_id", sa.Integer(), sa.ForeignKey("announcements.id"), nullable=False),
+            sa.Column("child_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("dismissed_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("announcement_id", "child_id", name="uq_announcement_dismissals_announcement_child"),
+        ]),
+    ]
+
+
+# Columns declared index=True / unique=True on the models
+INDEXES = [
+    ("ix_users_email", "users", ["email"], True),
+    ("ix_users_username", "users", ["username"], True),
+] + [
+    (f"ix_{table}_id", table, ["id"], False)
+    for table in (
+        "users", "badges", "tasks", "submissions", "submission_evidence", "points_ledger", "parent_settings",
+        "rewards", "reward_redemptions", "child_badges", "announcements", "announcement_reads",
+        "announcement_dismissals",
+    )
+]
+
+# Unique keys the ON CONFLICT DO NOTHING writes rely on. New tables get them as constraints above;
+# tables from before they were declared got a unique index from the old startup code, or get one here.
+UNIQUE = [
+    ("uq_child_badges_child_badge", "child_badges", ["child_id", "badge_id"]),
+    ("uq_announcement_reads_announcement_child", "announcement_reads", ["announcement_id", "child_id"]),
+    ("uq_announcement_dismissals_announcement_child", "announcement_dismissals", ["announcement_id", "child_id"]),
+]
+
+# The badge catalog as of this revision, frozen here; new badges need their own revision
+BADGES = [
+    {"code": "BIBLE_READER", "name": "Bible Reader", "description": "5 FAITH submissions on different days", "criteria_type": "BIBLE_READER"},
+    {"code": "HOMEWORK_HERO", "name": "Homework Hero", "description": "10 approved SCHOOL submissions", "criteria_type": "HOMEWORK_HERO"},
+    {"code": "KIND_HEART", "name": "Kind Heart", "description": "10 approved KINDNESS submissions", "criteria_type": "KIND_HEART"},
+    {"code": "LEVEL_2", "name": "Level 2 Reached", "description": "Reached 200 Points", "criteria_type": "POINTS_200"},
+    {"code": "LEVEL_3", "name": "Level 3 Reached", "description": "Reached 400 Points", "criteria_type": "POINTS_400"},
+    {"code": "LEVEL_4", "name": "Level 4 Reached", "description": "Reached 700 Points", "criteria_type": "POINTS_700"},
+    {"code": "LEVEL_5", "name": "Level 5 Reached", "description": "Reached 1000 Points", "criteria_type": "POINTS_1000"},
+]
+
+
+def upgrade():
+    offline = op.get_context().as_sql
+    inspector = None if offline else sa.inspect(op.get_bind())
+    existing = set() if offline else set(inspector.get_table_names())
+
+    for table, columns in _tables():
+        if table not in existing:
+            op.create_table(table, *columns)
+
+    # Column added after the first production deploy (was raw_migrate_fix.py / the startup probe)
+    if "submissions" in existing and "evidence_file_path" not in {c["name"] for c in inspector.get_columns("submissions")}:
+        op.add_column("submissions", sa.Column("evidence_file_path", sa.String(), nullable=True))
+
+    indexes = {} if offline else {t: {ix["name"] for ix in inspector.get_indexes(t)} for t in existing}
+    for name, table, columns, unique in INDEXES:
+        if name not in indexes.get(table, ()):
+            op.create_index(name, table, columns, unique=unique)
+
+    for name, table, columns in UNIQUE:
+        if table not in existing or name in indexes[table]:
+            continue
+        # Keep the oldest of any duplicates
+        cols = ", ".join(columns)
+        op.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {cols})")
+        op.create_index(name, table, columns, unique=True)
+
+    # Badge catalog (was seeded on every boot)
+    badges = sa.table(
+        "badges",
+        sa.column("code", sa.String), sa.column("name", sa.String), sa.column("description", sa.Text),
+        sa.column("criteria_type", sa.String), sa.column("is_active", sa.Boolean),
+    )
+    seeded = set() if offline or "badges" not in existing else {
+        code for (code,) in op.get_bind().execute(sa.text("SELECT code FROM badges"))
+    }
+    rows = [{**b, "is_active": True} for b in BADGES if b["code"] not in seeded]
+    if rows:
+        op.bulk_insert(badges, rows)
+
+
+def downgrade():
+    for table, _ in reversed(_tables()):
+        op.drop_table(table)
+    if op.get_context().dialect.name == "postgresql":
+        for enum in ("rewardredemptionstatus", "rewardtype", "submissionstatus", "categoryenum", "roleenum"):
+            op.execute(f"DROP TYPE IF EXISTS {enum}")
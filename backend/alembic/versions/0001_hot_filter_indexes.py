@@ -0,0 +1,43 @@
+"""Composite and partial indexes for the hot filters
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ("ix_points_ledger_child_created", "points_ledger", ["child_id", "created_at"], None),
+    ("ix_submissions_child_created", "submissions", ["child_id", "created_at"], None),
+    ("ix_submissions_pending_child_created", "submissions", ["child_id", "created_at"], "status = 'PENDING'"),
+    ("ix_tasks_parent_active_category", "tasks", ["parent_id", "is_active", "category"], None),
+    ("ix_rewards_parent_active", "rewards", ["parent_id"], "is_active"),
+    ("ix_users_parent_id", "users", ["parent_id"], None),
+    ("ix_announcements_parent_active_created", "announcements", ["parent_id", "is_active", "created_at"], None),
+    ("ix_reward_redemptions_requested_reward", "reward_redemptions", ["reward_id"], "status = 'REQUESTED'"),
+]
+
+
+def upgrade():
+    # Databases built by the old create_all-on-startup path may already have them
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    for name, table, columns, where in INDEXES:
+        if inspector and name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        predicate = sa.text(where) if where else None
+        op.create_index(name, table, columns, postgresql_where=predicate, sqlite_where=predicate)
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
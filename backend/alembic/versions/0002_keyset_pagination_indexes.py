@@ -0,0 +1,64 @@
+"""Indexes ending in (created_at, id) for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial predicate); each replaces the index it's paired with in REPLACED
+INDEXES = [
+    ("ix_users_parent_created_id", "users", ["parent_id", "created_at", "id"], None),
+    ("ix_tasks_parent_created_id", "tasks", ["parent_id", "created_at", "id"], None),
+    ("ix_submissions_child_created_id", "submissions", ["child_id", "created_at", "id"], None),
+    ("ix_rewards_active_parent_created_id", "rewards", ["parent_id", "created_at", "id"], "is_active"),
+    ("ix_announcements_parent_created_id", "announcements", ["parent_id", "created_at", "id"], None),
+]
+
+# Superseded: the new index has the same leading columns
+REPLACED = [
+    ("ix_users_parent_id", "users", ["parent_id"], None),
+    ("ix_submissions_child_created", "submissions", ["child_id", "created_at"], None),
+    ("ix_rewards_parent_active", "rewards", ["parent_id"], "is_active"),
+    ("ix_announcements_parent_active_created", "announcements", ["parent_id", "is_active", "created_at"], None),
+]
+
+
+def _existing(inspector, table):
+    return {ix["name"] for ix in inspector.get_indexes(table)} if inspector else set()
+
+
+def _create(indexes):
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    for name, table, columns, where in indexes:
+        if name in _existing(inspector, table):
+            continue
+        predicate = sa.text(where) if where else None
+        op.create_index(name, table, columns, postgresql_where=predicate, sqlite_where=predicate)
+
+
+def _drop(indexes):
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    for name, table, _, _ in indexes:
+        if inspector and name not in _existing(inspector, table):
+            continue
+        op.drop_index(name, table_name=table)
+
+
+def upgrade():
+    _create(INDEXES)
+    _drop(REPLACED)
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    _create(REPLACED)
+    _drop(INDEXES)
@@ -0,0 +1,28 @@
+"""Per-family version stamp behind the ETags
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Families without a row are at version 0; the first write creates it
+    op.create_table(
+        "family_versions",
+        sa.Column("parent_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("family_versions")
@@ -0,0 +1,36 @@
+"""Indexes for evidence lookups, the redemption queue and dismissed announcements
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns); found by tests/test_query_plans.py falling back to a table scan
+INDEXES = [
+    ("ix_submission_evidence_submission_id", "submission_evidence", ["submission_id"]),
+    ("ix_rewards_parent_id", "rewards", ["parent_id"]),
+    ("ix_announcement_dismissals_child_id", "announcement_dismissals", ["child_id"]),
+]
+
+
+def upgrade():
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector and name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns)
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
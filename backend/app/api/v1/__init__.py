@@ -1 +1 @@
-from . import auth, children, tasks, submissions, points, settings, rewards, users, uploads, announcements
+from . import auth, children, tasks, submissions, points, settings, rewards, users, uploads, announcements, internal
@@ -1,97 +1,151 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select, delete, literal, null
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import rows
+from app.db.session import get_async_db, SessionRoute
+from app.db.upsert import dialect_insert
 from app.models import models
-from app.schemas import schemas
+from app.schemas import schemas, serializers
 from datetime import datetime
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, Principal
+from app.core.response_cache import cached_response
+from app.core.pagination import Page
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 @router.post("", response_model=schemas.AnnouncementOut)
-def create_announcement(
+async def create_announcement(
     payload: schemas.AnnouncementCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Only parents can create announcements")
         
     ann = models.Announcement(
         parent_id=current_user.id,
-        message=payload.message
+        message=payload.message,
+        reads=[]
     )
     db.add(ann)
-    db.commit()
-    db.refresh(ann)
-    return ann
+    await db.flush()
+    return serializers.response(schemas.AnnouncementOut, ann)
 
-@router.get("", response_model=List[schemas.AnnouncementOut])
-def list_announcements(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+async def _with_reads(db: AsyncSession, page: Page, query):
+    query = page.apply(query, models.Announcement.created_at, models.Announcement.id)
+    anns = page.trim((await db.execute(query)).mappings())
+    if not anns:
+        return page.wrap([])
+    reads = rows.group_by((await db.execute(
+        select(
+            models.AnnouncementRead.announcement_id,
+            *rows.columns(models.AnnouncementRead, schemas.AnnouncementReadOut),
+            null().label("child_name"),
+        ).where(models.AnnouncementRead.announcement_id.in_([a["id"] for a in anns]))
+        .order_by(models.AnnouncementRead.id)
+    )).mappings(), "announcement_id")
+    return rows.RowsResponse(page.wrap([{**a, "reads": reads.get(a["id"], [])} for a in anns]))
+
+@router.get("", response_model=schemas.Paginated[schemas.AnnouncementOut], dependencies=[Depends(cached_response)])
+async def list_announcements(
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
+    columns = rows.columns(models.Announcement, schemas.AnnouncementOut)
     if current_user.role == models.RoleEnum.PARENT:
         # Parent sees all their announcements
-        return db.query(models.Announcement).filter(models.Announcement.parent_id == current_user.id).order_by(models.Announcement.created_at.desc()).all()
+        query = select(*columns).where(
+            models.Announcement.parent_id == current_user.id
+        )
+        return await _with_reads(db, page, query)
     else:
         # Child sees active announcements from their parent, excluding dismissed ones
         if not current_user.parent_id:
-             return []
+             return page.wrap([])
         
         # Get IDs of dismissed announcements
-        dismissed_ids = db.query(models.AnnouncementDismissal.announcement_id).filter(
+        dismissed_ids = (await db.execute(select(models.AnnouncementDismissal.announcement_id).where(
             models.AnnouncementDismissal.child_id == current_user.id
-        ).all()
-        dismissed_ids = [d[0] for d in dismissed_ids]
+        ))).scalars().all()
         
-        anns = db.query(models.Announcement).filter(
+        query = select(*columns).where(
             models.Announcement.parent_id == current_user.parent_id,
             models.Announcement.is_active == True,
             ~models.Announcement.id.in_(dismissed_ids) if dismissed_ids else True
-        ).order_by(models.Announcement.created_at.desc()).all()
+        )
         
-        return anns
+        return await _with_reads(db, page, query)
 
 @router.post("/{announcement_id}/read")
-def mark_read(
+async def mark_read(
     announcement_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.CHILD:
         raise HTTPException(status_code=403)
-        
-    # Check if exists
-    ann = db.query(models.Announcement).filter(models.Announcement.id == announcement_id).first()
+
+    # One statement: inserts only if the announcement exists and is from the child's parent,
+    # and is a no-op if it was already read
+    source = select(
+        models.Announcement.id, literal(current_user.id), literal(datetime.utcnow())
+    ).where(
+        models.Announcement.id == announcement_id,
+        models.Announcement.parent_id == current_user.parent_id
+    )
+    stmt = dialect_insert(db, models.AnnouncementRead).from_select(
+        ["announcement_id", "child_id", "read_at"], source
+    ).on_conflict_do_nothing()
+    if (await db.execute(stmt)).rowcount:
+        return {"status": "ok"}
+
+    # Nothing inserted: either already read, or no such announcement
+    ann = (await db.execute(select(models.Announcement.id).where(
+        models.Announcement.id == announcement_id,
+        models.Announcement.parent_id == current_user.parent_id
+    ))).first()
     if not ann:
         raise HTTPException(status_code=404)
-        
-    # Check if already read
-    existing = db.query(models.AnnouncementRead).filter(
-        models.AnnouncementRead.announcement_id == announcement_id,
-        models.AnnouncementRead.child_id == current_user.id
-    ).first()
-    
-    if not existing:
-        read = models.AnnouncementRead(
-            announcement_id=announcement_id,
-            child_id=current_user.id
-        )
-        db.add(read)
-        db.commit()
-        
+
     return {"status": "ok"}
 
 @router.delete("/{announcement_id}")
-def delete_announcement(
+async def delete_announcement(
     announcement_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
+    if current_user.role == models.RoleEnum.CHILD:
+        # Child can only dismiss if they've read it. Selecting from their read receipt enforces
+        # that in the same statement, and ON CONFLICT makes a repeated dismiss a no-op.
+        source = select(
+            models.AnnouncementRead.announcement_id, models.AnnouncementRead.child_id, literal(datetime.utcnow())
+        ).where(
+            models.AnnouncementRead.announcement_id == announcement_id,
+            models.AnnouncementRead.child_id == current_user.id
+        )
+        stmt = dialect_insert(db, models.AnnouncementDismissal).from_select(
+            ["announcement_id", "child_id", "dismissed_at"], source
+        ).on_conflict_do_nothing()
+        if (await db.execute(stmt)).rowcount:
+            return {"status": "dismissed"}
+
+        # Nothing inserted: missing, unread, or already dismissed
+        ann = await db.get(models.Announcement, announcement_id)
+        if not ann:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        has_read = (await db.execute(select(models.AnnouncementRead.id).where(
+            models.AnnouncementRead.announcement_id == announcement_id,
+            models.AnnouncementRead.child_id == current_user.id
+        ))).first()
+        if not has_read:
+            raise HTTPException(status_code=403, detail="You must read the announcement before dismissing it")
+
+        return {"status": "dismissed"}
+
     # Check if announcement exists
-    ann = db.query(models.Announcement).filter(models.Announcement.id == announcement_id).first()
+    ann = await db.get(models.Announcement, announcement_id)
     if not ann:
         raise HTTPException(status_code=404, detail="Announcement not found")
     
@@ -99,36 +153,12 @@ def delete_announcement(
         # Parent can delete their own announcements
         if ann.parent_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not your announcement")
-        db.delete(ann)
-        db.commit()
+        # Receipts reference the announcement (FKs are enforced on SQLite too)
+        for model in (models.AnnouncementRead, models.AnnouncementDismissal):
+            await db.execute(delete(model).where(model.announcement_id == announcement_id))
+        await db.delete(ann)
         return {"status": "deleted"}
     
-    elif current_user.role == models.RoleEnum.CHILD:
-        # Child can only dismiss if they've read it
-        has_read = db.query(models.AnnouncementRead).filter(
-            models.AnnouncementRead.announcement_id == announcement_id,
-            models.AnnouncementRead.child_id == current_user.id
-        ).first()
-        
-        if not has_read:
-            raise HTTPException(status_code=403, detail="You must read the announcement before dismissing it")
-        
-        # Check if already dismissed
-        existing_dismissal = db.query(models.AnnouncementDismissal).filter(
-            models.AnnouncementDismissal.announcement_id == announcement_id,
-            models.AnnouncementDismissal.child_id == current_user.id
-        ).first()
-        
-        if not existing_dismissal:
-            dismissal = models.AnnouncementDismissal(
-                announcement_id=announcement_id,
-                child_id=current_user.id
-            )
-            db.add(dismissal)
-            db.commit()
-        
-        return {"status": "dismissed"}
-    
     raise HTTPException(status_code=403)
 
 
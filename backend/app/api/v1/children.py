@@ -1,42 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, SessionRoute
 from app.schemas import schemas
 from app.models import models
+from app.core import security
 from app.core.auth import get_current_user
-from app.services import streaks
+from app.core.family import FamilyContext, get_family_context
+from app.core.response_cache import cached_monthly_response
+from app.core.pagination import Page
+from app.core import invalidation
+from app.services import streaks, ledger
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 @router.post("", response_model=schemas.UserOut)
-def create_child(payload: schemas.ChildCreate, db: Session = Depends(get_db), current=Depends(get_current_user)):
+async def create_child(payload: schemas.ChildCreate, db: AsyncSession = Depends(get_async_db), current=Depends(get_current_user)):
     if current.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403)
-    existing = db.query(models.User).filter(models.User.username==payload.username).first()
+    existing = (await db.execute(select(models.User).where(models.User.username==payload.username))).scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Username taken")
-    from app.core import security
-    hashed = security.get_password_hash(payload.password)
+    # Don't hold a pooled connection while bcrypt runs
+    await db.close()
+    hashed = await security.get_password_hash_async(payload.password)
     child = models.User(name=payload.name, username=payload.username, password_hash=hashed, role=models.RoleEnum.CHILD, parent_id=current.id)
     db.add(child)
-    db.commit()
-    db.refresh(child)
+    await db.flush()
+    invalidation.publish(db, current.id, "family")
     return child
 
-@router.get("", response_model=List[schemas.UserOut])
-def list_children(db: Session = Depends(get_db), current=Depends(get_current_user)):
+@router.get("", response_model=schemas.Paginated[schemas.UserOut])
+async def list_children(page: Page = Depends(), db: AsyncSession = Depends(get_async_db), current=Depends(get_current_user)):
     if current.role == models.RoleEnum.PARENT:
-        children = db.query(models.User).filter(models.User.parent_id==current.id).all()
-        return children
+        query = page.apply(select(models.User).where(models.User.parent_id==current.id), models.User.created_at, models.User.id, descending=False)
+        children = (await db.execute(query)).scalars().all()
+        return page.wrap(page.trim(children))
     else:
          # A child can only see themselves? Or siblings? Let's say themselves for now or forbidden.
          raise HTTPException(status_code=403, detail="Parent only")
 
-@router.get("/{child_id}/summary", response_model=schemas.ChildFullSummary)
-def get_child_summary(child_id: int, db: Session = Depends(get_db), current=Depends(get_current_user)):
+@router.get("/{child_id}/summary", response_model=schemas.ChildFullSummary, dependencies=[Depends(cached_monthly_response)])
+async def get_child_summary(
+    child_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user),
+    family: FamilyContext = Depends(get_family_context),
+):
     # Parent can view own child; Child can view own self.
-    child_user = db.query(models.User).filter(models.User.id==child_id).first()
+    child_user = await db.get(models.User, child_id)
     if not child_user:
          raise HTTPException(status_code=404, detail="Child not found")
 
@@ -51,38 +63,26 @@ def get_child_summary(child_id: int, db: Session = Depends(get_db), current=Depe
     child = child_user
 
     # Points
-    ledger = db.query(models.PointsLedger).filter(models.PointsLedger.child_id == child_id).all()
-    total_points = sum(l.delta_points for l in ledger)
+    total_points = (await db.run_sync(ledger.get_balance, child_id)).balance
     
-    # Money conversion
-    settings = db.query(models.ParentSettings).filter(models.ParentSettings.parent_id == child.parent_id).first()
-    if not settings:
-        settings = models.ParentSettings(parent_id=child.parent_id) 
-        # Set defaults for transient object since they aren't auto-populated by SA default=...
-        settings.points_per_dollar = 100
-    
-    if settings.points_per_dollar is None:
-        settings.points_per_dollar = 100
-
-    money_eq = (total_points / settings.points_per_dollar) if settings.points_per_dollar > 0 else 0
-    
-    # This month money (simple approx or exact calculation needed? Requirement says "thisMonthMoneyEquivalent")
-    # For now, let's just make it simple or 0.
-    this_month = 0.0 # TODO: Calculate date range filter
+    # This month, from the monthly rollup row
+    month_points = (await db.run_sync(ledger.get_month, child_id)).net_points
     
     points_summary = schemas.PointsSummary(
         totalPoints=total_points,
-        totalMoneyEquivalent=money_eq,
-        thisMonthMoneyEquivalent=this_month
+        totalMoneyEquivalent=family.to_money(total_points),
+        thisMonthMoneyEquivalent=family.to_money(month_points)
     )
     
-    # Badges
-    badges = db.query(models.ChildBadge).filter(models.ChildBadge.child_id == child_id).all()
+    # Badges, joined to their catalog row
+    badges = (await db.execute(
+        select(models.ChildBadge, models.Badge)
+        .join(models.Badge, models.ChildBadge.badge_id == models.Badge.id)
+        .where(models.ChildBadge.child_id == child_id)
+    )).all()
     # Need to convert to schema format which expects nested badge
     child_badges_out = []
-    for cb in badges:
-        # We need to fetch the actual badge info
-        b_info = db.query(models.Badge).filter(models.Badge.id == cb.badge_id).first()
+    for cb, b_info in badges:
         child_badges_out.append(schemas.ChildBadgeOut(
             id=cb.id,
             child_id=cb.child_id,
@@ -103,8 +103,8 @@ def get_child_summary(child_id: int, db: Session = Depends(get_db), current=Depe
     )
 
 @router.get("/{child_id}", response_model=schemas.UserOut)
-def get_child(child_id: int, db: Session = Depends(get_db), current=Depends(get_current_user)):
-    child = db.query(models.User).filter(models.User.id==child_id).first()
+async def get_child(child_id: int, db: AsyncSession = Depends(get_async_db), current=Depends(get_current_user)):
+    child = await db.get(models.User, child_id)
     if not child:
         raise HTTPException(status_code=404)
     if current.role == models.RoleEnum.PARENT and child.parent_id != current.id:
@@ -114,11 +114,11 @@ def get_child(child_id: int, db: Session = Depends(get_db), current=Depends(get_
     return child
 
 @router.delete("/{child_id}")
-def delete_child(child_id: int, db: Session = Depends(get_db), current=Depends(get_current_user)):
+async def delete_child(child_id: int, db: AsyncSession = Depends(get_async_db), current=Depends(get_current_user)):
     if current.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Parent only")
     
-    child = db.query(models.User).filter(models.User.id == child_id).first()
+    child = await db.get(models.User, child_id)
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
         
@@ -137,12 +137,25 @@ def delete_child(child_id: int, db: Session = Depends(get_db), current=Depends(g
     # But user asked to "Delete".
     
     # Delete related first to be safe if no cascade
-    db.query(models.PointsLedger).filter(models.PointsLedger.child_id == child_id).delete()
-    db.query(models.Submission).filter(models.Submission.child_id == child_id).delete()
-    db.query(models.RewardRedemption).filter(models.RewardRedemption.child_id == child_id).delete()
-    db.query(models.ChildBadge).filter(models.ChildBadge.child_id == child_id).delete()
+    child_submissions = select(models.Submission.id).where(models.Submission.child_id == child_id)
+    await db.execute(delete(models.SubmissionEvidence).where(models.SubmissionEvidence.submission_id.in_(child_submissions)))
+    for model in (
+        models.ChildBalance,
+        models.ChildMonthlyPoints,
+        models.PointsLedger,
+        models.Submission,
+        models.RewardRedemption,
+        models.ChildBadge,
+        models.ChildStats,
+        models.ChildFaithDay,
+        models.AnnouncementRead,
+        models.AnnouncementDismissal,
+    ):
+        await db.execute(delete(model).where(model.child_id == child_id))
     
-    db.delete(child)
-    db.commit()
+    await db.delete(child)
+    # Every worker drops its cached principal for the child, once the delete is committed
+    invalidation.publish(db, current.id, "principal", child_id)
+    invalidation.publish(db, current.id, "family")
     
     return {"status": "ok"}
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from app.core import invalidation
+from app.core.auth import require_metrics_token
+from app.core.family import family_cache
+from app.core.principals import principal_cache
+from app.core.response_cache import response_cache
+from app.db import warmer
+from app.db.session import pool_metrics
+
+router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+@router.get("/principal-cache")
+def principal_cache_stats():
+    return principal_cache.stats()
+
+@router.get("/response-cache")
+def response_cache_stats():
+    return response_cache.stats()
+
+@router.get("/family-context")
+def family_context_stats():
+    return family_cache.stats()
+
+@router.get("/invalidation")
+def invalidation_stats():
+    return invalidation.stats()
+
+@router.get("/pool")
+def pool_stats():
+    return {
+        **{name: metrics.stats() for name, metrics in pool_metrics.items()},
+        "warmer": warmer.stats(),
+    }
@@ -1,113 +1,126 @@
-from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.models import Reward, RewardRedemption, User, RoleEnum, RewardRedemptionStatus, PointsLedger
-from app.schemas.schemas import RewardOut, RewardBase, RewardRedemptionOut, RewardRedemptionCreate
-from app.core.auth import get_current_user
-
-router = APIRouter()
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import rows
+from app.db.session import get_async_db, SessionRoute
+from app.models.models import Reward, RewardRedemption, RoleEnum, RewardRedemptionStatus
+from app.schemas.schemas import Paginated, RewardOut, RewardBase, RewardRedemptionOut, RewardRedemptionCreate
+from app.schemas import serializers
+from app.core.auth import get_current_user, Principal
+from app.core.idempotency import idempotent
+from app.core.response_cache import cached_response
+from app.core.pagination import Page
+from app.services import ledger
+import datetime
+
+router = APIRouter(route_class=SessionRoute)
 
 # --- Rewards Management (Parent) ---
 
 @router.post("/", response_model=RewardOut)
-def create_reward(
+async def create_reward(
     reward_in: RewardBase,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Only parents can create rewards")
     
     reward = Reward(**reward_in.dict(), parent_id=current_user.id)
     db.add(reward)
-    db.commit()
-    db.refresh(reward)
-    return reward
-
-@router.get("/", response_model=List[RewardOut])
-def list_rewards(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    await db.flush()
+    return serializers.response(RewardOut, reward)
+
+@router.get("/", response_model=Paginated[RewardOut], dependencies=[Depends(cached_response)])
+async def list_rewards(
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     parent_id = current_user.id if current_user.role == RoleEnum.PARENT else current_user.parent_id
     if not parent_id:
-        return []
+        return page.wrap([])
     
-    query = db.query(Reward).filter(Reward.parent_id == parent_id).filter(Reward.is_active == True)
+    # Bare is_active (not "= 1") so SQLite also matches the partial index
+    query = select(*rows.columns(Reward, RewardOut)).where(Reward.parent_id == parent_id).where(Reward.is_active)
+    query = page.apply(query, Reward.created_at, Reward.id, descending=False)
     
-    return query.all()
+    return rows.RowsResponse(page.wrap(page.trim((await db.execute(query)).mappings())))
 
 @router.put("/{reward_id}", response_model=RewardOut)
-def update_reward(
+async def update_reward(
     reward_id: int,
     reward_in: RewardBase,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Only parents can update rewards")
         
-    reward = db.query(Reward).filter(Reward.id == reward_id, Reward.parent_id == current_user.id).first()
+    reward = (await db.execute(select(Reward).where(Reward.id == reward_id, Reward.parent_id == current_user.id))).scalars().first()
     if not reward:
         raise HTTPException(status_code=404, detail="Reward not found")
         
     for field, value in reward_in.dict(exclude_unset=True).items():
         setattr(reward, field, value)
     
-    db.commit()
-    db.refresh(reward)
-    return reward
+    return serializers.response(RewardOut, reward)
 
 @router.delete("/{reward_id}")
-def delete_reward(
+async def delete_reward(
     reward_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Only parents can delete rewards")
     
-    reward = db.query(Reward).filter(Reward.id == reward_id, Reward.parent_id == current_user.id).first()
+    reward = (await db.execute(select(Reward).where(Reward.id == reward_id, Reward.parent_id == current_user.id))).scalars().first()
     if not reward:
         raise HTTPException(status_code=404, detail="Reward not found")
     
     # Soft delete
     reward.is_active = False
-    db.commit()
     return {"status": "ok"}
 
 # --- Redemptions ---
 
-@router.get("/redemptions/pending", response_model=List[RewardRedemptionOut])
-def list_pending_redemptions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/redemptions/pending", response_model=Paginated[RewardRedemptionOut])
+async def list_pending_redemptions(
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Parent only")
     
     # Get all redemptions for children owned by this parent where status is REQUESTED
     # Join Reward to check parent_id
-    redemptions = (
-        db.query(RewardRedemption)
+    redemptions = page.trim((await db.execute(page.apply(
+        select(*rows.columns(RewardRedemption, RewardRedemptionOut))
         .join(Reward)
-        .filter(Reward.parent_id == current_user.id)
-        .filter(RewardRedemption.status == RewardRedemptionStatus.REQUESTED)
-        .all()
-    )
-    return redemptions
-
-@router.post("/{reward_id}/redeem", response_model=RewardRedemptionOut)
-def redeem_reward(
+        .where(Reward.parent_id == current_user.id)
+        .where(RewardRedemption.status == RewardRedemptionStatus.REQUESTED),
+        RewardRedemption.created_at, RewardRedemption.id,
+    ))).mappings())
+    if not redemptions:
+        return page.wrap([])
+    rewards = {r["id"]: r for r in (await db.execute(
+        select(*rows.columns(Reward, RewardOut)).where(Reward.id.in_({r["reward_id"] for r in redemptions}))
+    )).mappings()}
+    return rows.RowsResponse(page.wrap([{**r, "reward": rewards[r["reward_id"]]} for r in redemptions]))
+
+@router.post("/{reward_id}/redeem", response_model=RewardRedemptionOut, dependencies=[Depends(idempotent)])
+async def redeem_reward(
     reward_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.CHILD:
         raise HTTPException(status_code=400, detail="Only children can redeem rewards")
     
-    reward = db.query(Reward).filter(Reward.id == reward_id).first()
+    reward = await db.get(Reward, reward_id)
     if not reward or not reward.is_active:
          raise HTTPException(status_code=404, detail="Reward not available")
     
@@ -115,48 +128,44 @@ def redeem_reward(
     if reward.parent_id != current_user.parent_id:
          raise HTTPException(status_code=403, detail="Not eligible for this reward")
     
-    # Check balance
-    total_ledger = db.query(PointsLedger).filter(PointsLedger.child_id == current_user.id).all()
-    balance = sum(r.delta_points for r in total_ledger)
-    
-    if balance < reward.cost_points:
-         raise HTTPException(status_code=400, detail="Insufficient points")
-    
-    # Deduct points immediately
-    ledger_entry = PointsLedger(
-        child_id=current_user.id,
-        delta_points=-reward.cost_points,
-        reason=f"Reward Redemption: {reward.name}",
-        # created_by_parent_id left null as it's system/child action
-    )
-    db.add(ledger_entry)
+    # Check balance and deduct points immediately, atomically per child
+    try:
+        await db.run_sync(
+            ledger.spend,
+            child_id=current_user.id,
+            cost_points=reward.cost_points,
+            reason=f"Reward Redemption: {reward.name}",
+            # created_by_parent_id left null as it's system/child action
+        )
+    except ledger.InsufficientPoints:
+        raise HTTPException(status_code=400, detail="Insufficient points")
 
     redemption = RewardRedemption(
         child_id=current_user.id,
         reward_id=reward.id,
         status=RewardRedemptionStatus.REQUESTED,
-        cost_points_at_time=reward.cost_points
+        cost_points_at_time=reward.cost_points,
+        reward=reward
     )
     db.add(redemption)
-    db.commit()
-    db.refresh(redemption)
+    await db.flush()
     # We might want to link the ledger to redemption if we had a FK, but we don't.
     
     return redemption
 
 @router.post("/redemptions/{redemption_id}/approve")
-def approve_redemption(
+async def approve_redemption(
     redemption_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Parent only")
     
-    redemption = db.query(RewardRedemption).join(Reward).filter(
+    redemption = (await db.execute(select(RewardRedemption).join(Reward).where(
         RewardRedemption.id == redemption_id,
         Reward.parent_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not redemption:
         raise HTTPException(status_code=404, detail="Redemption not found")
@@ -169,25 +178,23 @@ def approve_redemption(
     
     redemption.status = RewardRedemptionStatus.APPROVED
     redemption.processed_by_parent_id = current_user.id
-    import datetime
     redemption.processed_at = datetime.datetime.utcnow()
     
-    db.commit()
     return {"status": "approved"}
 
-@router.post("/redemptions/{redemption_id}/reject")
-def reject_redemption(
+@router.post("/redemptions/{redemption_id}/reject", dependencies=[Depends(idempotent)])
+async def reject_redemption(
     redemption_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Parent only")
 
-    redemption = db.query(RewardRedemption).join(Reward).filter(
+    redemption = (await db.execute(select(RewardRedemption).join(Reward).options(joinedload(RewardRedemption.reward)).where(
         RewardRedemption.id == redemption_id,
         Reward.parent_id == current_user.id
-    ).first()
+    ))).scalars().first()
 
     if not redemption:
         raise HTTPException(status_code=404, detail="Redemption not found")
@@ -196,18 +203,16 @@ def reject_redemption(
         raise HTTPException(status_code=400, detail="Redemption not pending")
 
     # Refund points
-    ledger_entry = PointsLedger(
+    await db.run_sync(
+        ledger.add_entry,
         child_id=redemption.child_id,
         delta_points=redemption.cost_points_at_time, # Positive value to refund
         reason=f"Refund: Rejected Reward {redemption.reward.name}",
         created_by_parent_id=current_user.id
     )
-    db.add(ledger_entry)
 
     redemption.status = RewardRedemptionStatus.REJECTED
     redemption.processed_by_parent_id = current_user.id
-    import datetime
     redemption.processed_at = datetime.datetime.utcnow()
     
-    db.commit()
     return {"status": "rejected"}
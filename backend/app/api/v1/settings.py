@@ -1,35 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.models import ParentSettings, User, RoleEnum
+from app.db.session import get_db, SessionRoute
+from app.models.models import ParentSettings, RoleEnum
 from app.schemas.schemas import ParentSettingsOut, ParentSettingsBase
-from app.core.auth import get_current_user
+from app.core import invalidation
+from app.core.auth import get_current_user, Principal
+from app.core.family import FamilyContext, get_family_context
+from app.core.response_cache import cached_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
-@router.get("/", response_model=ParentSettingsOut)
+@router.get("/", response_model=ParentSettingsOut, dependencies=[Depends(cached_response)])
 def get_settings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    family: FamilyContext = Depends(get_family_context),
 ):
-    if current_user.role != RoleEnum.PARENT:
-        # If child, they might not need this or only subset.
-        # Requirement: "Get ParentSettings for current parent (creating defaults if not present)."
-        # For child, we need to find their parent's settings.
-        if not current_user.parent_id:
-             raise HTTPException(status_code=400, detail="Child has no parent found")
-        parent_id = current_user.parent_id
-    else:
-        parent_id = current_user.id
+    # Requirement: "Get ParentSettings for current parent (creating defaults if not present)."
+    # For child, we need to find their parent's settings.
+    if family.settings_id is not None:
+        return ParentSettingsOut(
+            id=family.settings_id,
+            parent_id=family.parent_id,
+            points_per_dollar=family.points_per_dollar,
+            monthly_dollar_cap_per_child=family.monthly_dollar_cap_per_child,
+            show_money_to_children=family.show_money_to_children,
+        )
 
-    settings = db.query(ParentSettings).filter(ParentSettings.parent_id == parent_id).first()
+    settings = db.query(ParentSettings).filter(ParentSettings.parent_id == family.parent_id).first()
     if not settings:
         if current_user.role == RoleEnum.PARENT:
             # Create default
-            settings = ParentSettings(parent_id=parent_id)
+            settings = ParentSettings(parent_id=family.parent_id)
             db.add(settings)
-            db.commit()
-            db.refresh(settings)
+            db.flush()
+            invalidation.publish(db, family.parent_id, "family")
         else:
              raise HTTPException(status_code=404, detail="Settings not found")
     
@@ -39,7 +44,7 @@ def get_settings(
 def update_settings(
     settings_in: ParentSettingsBase,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != RoleEnum.PARENT:
         raise HTTPException(status_code=403, detail="Only parents can update settings")
@@ -52,6 +57,6 @@ def update_settings(
     for field, value in settings_in.dict(exclude_unset=True).items():
         setattr(settings, field, value)
     
-    db.commit()
-    db.refresh(settings)
+    db.flush()
+    invalidation.publish(db, current_user.id, "family")
     return settings
@@ -1,20 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import rows
+from app.db.session import get_async_db, SessionRoute
 from app.models import models
-from app.schemas import schemas
+from app.schemas import schemas, serializers
 from datetime import datetime
 from app.services import badges as badge_service
-from app.core.auth import get_current_user
+from app.services import ledger, stats
+from app.core.auth import get_current_user, Principal
+from app.core.idempotency import idempotent
+from app.core.pagination import Page
+from app.core.response_cache import cached_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 @router.post("", response_model=schemas.SubmissionOut)
-def create_submission(
+async def create_submission(
     payload: schemas.SubmissionCreate, 
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.CHILD:
         raise HTTPException(status_code=403, detail="Only children can submit tasks")
@@ -37,8 +43,7 @@ def create_submission(
             evidence_file_path=primary_evidence_path
         )
         db.add(submission)
-        db.commit()
-        db.refresh(submission)
+        await db.flush()
 
         # Add evidence records
         if payload.evidence_files:
@@ -65,99 +70,225 @@ def create_submission(
             except Exception as e:
                 print(f"Error adding single evidence: {e}")
         
-        db.commit()
-        db.refresh(submission)
-        return submission
+        await db.flush()
+        # evidence must be loaded here; lazy loading isn't available on an AsyncSession
+        await db.refresh(submission, attribute_names=["evidence"])
+        return serializers.response(schemas.SubmissionOut, submission)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating submission: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating submission: {str(e)}")
 
-@router.get("/my", response_model=List[schemas.SubmissionOut])
-def my_submissions(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+@router.get("/my", response_model=schemas.Paginated[schemas.SubmissionOut])
+async def my_submissions(
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.CHILD:
         raise HTTPException(status_code=403)
         
-    subs = db.query(models.Submission).filter(models.Submission.child_id == current_user.id).order_by(models.Submission.created_at.desc()).all()
-    return subs
+    subs = page.trim((await db.execute(page.apply(
+        select(*rows.columns(models.Submission, schemas.SubmissionOut))
+        .where(models.Submission.child_id == current_user.id),
+        models.Submission.created_at, models.Submission.id,
+    ))).mappings())
+    if not subs:
+        return page.wrap([])
+    evidence = rows.group_by((await db.execute(
+        select(models.SubmissionEvidence.submission_id, *rows.columns(models.SubmissionEvidence, schemas.SubmissionEvidenceOut))
+        .where(models.SubmissionEvidence.submission_id.in_([s["id"] for s in subs]))
+        .order_by(models.SubmissionEvidence.id)
+    )).mappings(), "submission_id")
+    return rows.RowsResponse(page.wrap([{**s, "evidence": evidence.get(s["id"], [])} for s in subs]))
 
-@router.get("/pending", response_model=List[schemas.SubmissionOut])
-def pending_submissions(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+@router.get("/pending", response_model=schemas.Paginated[schemas.SubmissionOut], dependencies=[Depends(cached_response)])
+async def pending_submissions(
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403)
     
     # Get all pending submissions for this parent's children
-    subs = (
-        db.query(models.Submission)
+    subs = (await db.execute(page.apply(
+        select(models.Submission)
+        .options(selectinload(models.Submission.evidence))
         .join(models.User, models.Submission.child_id == models.User.id)
-        .filter(models.User.parent_id == current_user.id)
-        .filter(models.Submission.status == models.SubmissionStatus.PENDING)
-        .all()
-    )
-    return subs
-
-@router.post("/{submission_id}/approve")
-def approve_submission(
+        .where(models.User.parent_id == current_user.id)
+        .where(models.Submission.status == models.SubmissionStatus.PENDING),
+        models.Submission.created_at, models.Submission.id,
+    ))).scalars().all()
+    return serializers.response(schemas.SubmissionOut, page.trim(subs), page=page)
+
+@router.post("/batch", response_model=schemas.SubmissionBatchResult, dependencies=[Depends(idempotent)])
+async def review_submissions_batch(
+    payload: schemas.SubmissionBatchReview,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if current_user.role != models.RoleEnum.PARENT:
+        raise HTTPException(status_code=403)
+
+    actions = {item.id: item.action for item in payload.items}
+    if len(actions) != len(payload.items):
+        raise HTTPException(status_code=400, detail="Duplicate submission ids")
+    if not actions:
+        return {"approved": [], "rejected": []}
+
+    # One query for existence, ownership, status and task points
+    candidates = (await db.execute(
+        select(models.Submission.id, models.Submission.child_id, models.Submission.status, models.Submission.created_at, models.Task.points, models.Task.category)
+        .join(models.User, models.Submission.child_id == models.User.id)
+        .outerjoin(models.Task, models.Submission.task_id == models.Task.id)
+        .where(models.Submission.id.in_(list(actions)))
+        .where(models.User.parent_id == current_user.id)
+    )).all()
+    found = {r.id for r in candidates}
+    missing = sorted(set(actions) - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Submissions not found: {missing}")
+    not_pending = sorted(r.id for r in candidates if r.status != models.SubmissionStatus.PENDING)
+    if not_pending:
+        raise HTTPException(status_code=409, detail=f"Submissions not pending: {not_pending}")
+
+    approved = sorted(i for i, a in actions.items() if a == schemas.ReviewAction.APPROVE)
+    rejected = sorted(i for i, a in actions.items() if a == schemas.ReviewAction.REJECT)
+    approved_rows = [r for r in candidates if actions[r.id] == schemas.ReviewAction.APPROVE]
+    now = datetime.utcnow()
+
+    # Backfill badge counters before the status UPDATE, so a first-time backfill doesn't count these twice
+    by_child = {}
+    for r in approved_rows:
+        if r.category is not None:
+            by_child.setdefault(r.child_id, []).append((r.category, r.created_at))
+    for child_id in by_child:
+        await db.run_sync(stats.get_stats, child_id)
+
+    # The status guard makes a concurrent review of the same submissions match nothing here,
+    # so it gets a 409 instead of crediting the ledger a second time
+    if approved:
+        result = await db.execute(update(models.Submission).where(
+            models.Submission.id.in_(approved),
+            models.Submission.status == models.SubmissionStatus.PENDING,
+        ).values(
+            status=models.SubmissionStatus.APPROVED,
+            approved_at=now,
+            reviewed_by_parent_id=current_user.id,
+        ))
+        if result.rowcount != len(approved):
+            raise HTTPException(status_code=409, detail="Submissions were reviewed concurrently")
+    if rejected:
+        result = await db.execute(update(models.Submission).where(
+            models.Submission.id.in_(rejected),
+            models.Submission.status == models.SubmissionStatus.PENDING,
+        ).values(
+            status=models.SubmissionStatus.REJECTED,
+            reviewed_by_parent_id=current_user.id,
+        ))
+        if result.rowcount != len(rejected):
+            raise HTTPException(status_code=409, detail="Submissions were reviewed concurrently")
+
+    for child_id, approvals in by_child.items():
+        await db.run_sync(stats.record_approvals, child_id, approvals)
+
+    await db.run_sync(ledger.add_entries, [
+        {
+            "child_id": r.child_id,
+            "delta_points": r.points,
+            "reason": "TASK_APPROVED",
+            "related_submission_id": r.id,
+            "created_by_parent_id": current_user.id,
+        }
+        for r in approved_rows
+        if r.points is not None
+    ])
+
+    for child_id in sorted({r.child_id for r in approved_rows}):
+        await db.run_sync(badge_service.check_and_award_badges, child_id)
+    return {"approved": approved, "rejected": rejected}
+
+@router.post("/{submission_id}/approve", dependencies=[Depends(idempotent)])
+async def approve_submission(
     submission_id: int, 
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403)
 
-    sub = db.query(models.Submission).filter(models.Submission.id == submission_id).first()
+    sub = await db.get(models.Submission, submission_id)
     if not sub:
         raise HTTPException(status_code=404)
         
     # Verify child belongs to parent
-    child = db.query(models.User).filter(models.User.id == sub.child_id).first()
+    child = await db.get(models.User, sub.child_id)
     if not child or child.parent_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your child's submission")
 
-    sub.status = models.SubmissionStatus.APPROVED
-    sub.approved_at = datetime.utcnow()
-    sub.reviewed_by_parent_id = current_user.id
+    if sub.status != models.SubmissionStatus.PENDING:
+        raise HTTPException(status_code=400, detail="Submission not pending")
+
+    task = await db.get(models.Task, sub.task_id)
+    if task:
+        # Backfill before the status change, see stats._load_stats
+        await db.run_sync(stats.get_stats, sub.child_id)
+
+    # Guarded on PENDING so a concurrent approval can't pay the child twice
+    result = await db.execute(update(models.Submission).where(
+        models.Submission.id == submission_id,
+        models.Submission.status == models.SubmissionStatus.PENDING,
+    ).values(
+        status=models.SubmissionStatus.APPROVED,
+        approved_at=datetime.utcnow(),
+        reviewed_by_parent_id=current_user.id,
+    ))
+    if result.rowcount != 1:
+        raise HTTPException(status_code=409, detail="Submission was reviewed concurrently")
     
-    task = db.query(models.Task).filter(models.Task.id == sub.task_id).first()
     if task:
-        pl = models.PointsLedger(
+        await db.run_sync(stats.record_approval, sub.child_id, task.category, sub.created_at)
+        await db.run_sync(
+            ledger.add_entry,
             child_id=sub.child_id,
             delta_points=task.points,
             reason="TASK_APPROVED",
             related_submission_id=sub.id,
             created_by_parent_id=current_user.id
         )
-        db.add(pl)
     
-    db.commit()
-    badge_service.check_and_award_badges(db, sub.child_id)
+    await db.run_sync(badge_service.check_and_award_badges, sub.child_id)
     return {"status": "approved"}
 
 @router.post("/{submission_id}/reject")
-def reject_submission(
+async def reject_submission(
     submission_id: int, 
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != models.RoleEnum.PARENT:
         raise HTTPException(status_code=403)
 
-    sub = db.query(models.Submission).filter(models.Submission.id == submission_id).first()
+    sub = await db.get(models.Submission, submission_id)
     if not sub:
         raise HTTPException(status_code=404)
 
     # Verify child belongs to parent
-    child = db.query(models.User).filter(models.User.id == sub.child_id).first()
+    child = await db.get(models.User, sub.child_id)
     if not child or child.parent_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your child's submission")
 
-    sub.status = models.SubmissionStatus.REJECTED
-    sub.reviewed_by_parent_id = current_user.id
-    db.commit()
+    if sub.status != models.SubmissionStatus.PENDING:
+        raise HTTPException(status_code=400, detail="Submission not pending")
+
+    result = await db.execute(update(models.Submission).where(
+        models.Submission.id == submission_id,
+        models.Submission.status == models.SubmissionStatus.PENDING,
+    ).values(
+        status=models.SubmissionStatus.REJECTED,
+        reviewed_by_parent_id=current_user.id,
+    ))
+    if result.rowcount != 1:
+        raise HTTPException(status_code=409, detail="Submission was reviewed concurrently")
     return {"status": "rejected"}
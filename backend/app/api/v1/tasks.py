@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db import rows
+from app.db.session import get_db, SessionRoute
 from app.models import models
 from typing import Optional
-from app.schemas import schemas
+from app.schemas import schemas, serializers
 from app.core.auth import get_current_user
+from app.core.response_cache import cached_response
+from app.core.pagination import Page
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 @router.post("", response_model=schemas.TaskOut)
 def create_task(payload: schemas.TaskBase, db: Session = Depends(get_db), current = Depends(get_current_user)):
@@ -14,24 +18,24 @@ def create_task(payload: schemas.TaskBase, db: Session = Depends(get_db), curren
         raise HTTPException(status_code=403, detail="Parent only")
     task = models.Task(parent_id=current.id, name=payload.name, description=payload.description, category=payload.category, points=payload.points, is_active=payload.is_active)
     db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+    db.flush()
+    return serializers.response(schemas.TaskOut, task)
 
-@router.get("")
-def list_tasks(category: Optional[str] = None, active: Optional[bool] = None, db: Session = Depends(get_db), current = Depends(get_current_user)):
-    q = db.query(models.Task)
+@router.get("", response_model=schemas.Paginated[schemas.TaskOut], dependencies=[Depends(cached_response)])
+def list_tasks(category: Optional[str] = None, active: Optional[bool] = None, page: Page = Depends(), db: Session = Depends(get_db), current = Depends(get_current_user)):
+    q = select(*rows.columns(models.Task, schemas.TaskOut))
     if current.role == models.RoleEnum.PARENT:
-        q = q.filter(models.Task.parent_id == current.id)
+        q = q.where(models.Task.parent_id == current.id)
     elif current.role == models.RoleEnum.CHILD:
         # Child sees tasks from their parent
-        q = q.filter(models.Task.parent_id == current.parent_id)
+        q = q.where(models.Task.parent_id == current.parent_id)
         
     if category:
-        q = q.filter(models.Task.category==category)
+        q = q.where(models.Task.category==category)
     if active is not None:
-        q = q.filter(models.Task.is_active==active)
-    return q.all()
+        q = q.where(models.Task.is_active==active)
+    q = page.apply(q, models.Task.created_at, models.Task.id, descending=False)
+    return rows.RowsResponse(page.wrap(page.trim(db.execute(q).mappings())))
 
 
 @router.get("/{task_id}", response_model=schemas.TaskOut)
@@ -39,7 +43,7 @@ def get_task(task_id: int, db: Session = Depends(get_db)):
     task = db.query(models.Task).filter(models.Task.id==task_id).first()
     if not task:
         raise HTTPException(status_code=404)
-    return task
+    return serializers.response(schemas.TaskOut, task)
 
 @router.delete("/{task_id}")
 def delete_task(task_id: int, db: Session = Depends(get_db), current = Depends(get_current_user)):
@@ -65,11 +69,12 @@ def delete_task(task_id: int, db: Session = Depends(get_db), current = Depends(g
             # 2. Update PointsLedger to decouple from these submissions before deleting
             db.query(models.PointsLedger).filter(models.PointsLedger.related_submission_id.in_(sub_ids)).update({models.PointsLedger.related_submission_id: None}, synchronize_session=False)
 
-            # 3. Delete Submissions
+            # 3. Delete their evidence rows, then the Submissions
+            db.query(models.SubmissionEvidence).filter(models.SubmissionEvidence.submission_id.in_(sub_ids)).delete(synchronize_session=False)
             db.query(models.Submission).filter(models.Submission.task_id == task_id).delete(synchronize_session=False)
         
         db.delete(task)
-        db.commit()
+        db.flush()
     except Exception as e:
         print(f"Error deleting task {task_id}: {e}")
         db.rollback()
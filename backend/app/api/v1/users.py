@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import get_db, SessionRoute
 from app.models import models
 from app.schemas import schemas
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, Principal
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 @router.get("/me", response_model=schemas.UserOut)
-def read_users_me(current_user: models.User = Depends(get_current_user)):
-    return current_user
+def read_users_me(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    # The principal only carries id/role/parent_id; the profile needs the full row
+    user = db.query(models.User).filter(models.User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404)
+    return user
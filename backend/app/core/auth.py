@@ -1,17 +1,19 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models import models
 from app.core import security
 from app.core.config import settings
+from app.core.principals import Principal, principal_cache
+from app.services import family_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> models.User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -30,8 +32,26 @@ def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == user_id_int).first()
+    principal = principal_cache.get(user_id_int)
+    if principal is not None:
+        family_versions.current_family.set(family_versions.family_of(principal))
+        return principal
+
+    generation = principal_cache.generation
+    user = await db.get(models.User, user_id_int)
+    # Hand the connection back instead of holding it until the endpoint runs. Closing only
+    # detaches the loaded user; the endpoint can keep using the same session.
+    await db.close()
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(principal.id, principal, generation)
+    # Writes made by this request bump the family's version (see app.services.family_versions)
+    family_versions.current_family.set(family_versions.family_of(principal))
+    return principal
+
+def require_metrics_token(x_metrics_token: str = Header(None)):
+    # Internal monitoring endpoints are hidden unless METRICS_TOKEN is configured and presented
+    if not settings.METRICS_TOKEN or x_metrics_token != settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404)
@@ -0,0 +1,279 @@
+"""Cache backends for the app's shared caches.
+
+MemoryCache keeps entries in this process, which is all a single-worker deployment needs.
+RedisCache speaks the Redis protocol so every worker sees the same entries. get_cache() picks one
+per namespace from CACHE_URL. Values are bytes (callers serialize), keys are strings, and both
+backends count hits and misses for stats().
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # only needed when CACHE_URL points at Redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_OVERHEAD = 100  # rough bytes per entry beyond key and value: tuple, OrderedDict node
+
+
+class CacheBackend:
+    """get/set/delete, batch mget and compare-and-set; ttl is in seconds, None for the default."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def compare_and_set(self, key: str, expected: Optional[bytes], value: bytes, ttl: Optional[float] = None) -> bool:
+        """Stores `value` only if `key` still holds `expected` (None: only if it's missing)."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """LRU bounded by total bytes, with a TTL per entry. Safe to share between threads."""
+
+    def __init__(self, max_bytes: int, default_ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.cas_conflicts = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or (entry[2] is not None and entry[2] < time.monotonic()):
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]):
+        size = len(key) + len(value) + _ENTRY_OVERHEAD
+        if key in self._entries:
+            self._remove(key)
+        # An entry bigger than a tenth of the budget would flush most of the cache
+        if size * 10 > self.max_bytes:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = (value, size, time.monotonic() + ttl if ttl else None)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        self.bytes -= self._entries.pop(key)[1]
+
+    async def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    async def mget(self, keys):
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    async def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set(key, value, ttl)
+
+    async def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    async def compare_and_set(self, key, expected, value, ttl=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if (entry[0] if entry is not None else None) != expected:
+                self.cas_conflicts += 1
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "default_ttl": self.default_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "cas_conflicts": self.cas_conflicts,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# KEYS[1] = key; ARGV = expected, new value, ttl in ms ("" for none)
+_CAS_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[3] ~= '' then
+    redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+else
+    redis.call('SET', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisCache(CacheBackend):
+    """Redis (or anything speaking its protocol) behind a key prefix.
+
+    A cache outage must not fail requests: errors are counted and read as misses. The first error
+    of an outage is logged as a warning and the rest at debug, so an outage logs one line rather
+    than one per request; the first success afterwards logs the recovery.
+    `client` is a redis.asyncio client, or anything with its interface (e.g. a local stand-in).
+    """
+
+    def __init__(self, client, prefix: str = "", default_ttl: Optional[float] = None):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self._cas = client.register_script(_CAS_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.cas_conflicts = 0
+        self._failing = False
+
+    def _ttl_ms(self, ttl: Optional[float]) -> Optional[int]:
+        ttl = self.default_ttl if ttl is None else ttl
+        return int(ttl * 1000) if ttl else None
+
+    def _failed(self, op: str, e: Exception):
+        self.errors += 1
+        if self._failing:
+            logger.debug(f"Cache {op} failed: {e}")
+        else:
+            self._failing = True
+            logger.warning(f"Cache {op} failed, treating as misses until it recovers: {e}")
+
+    def _succeeded(self):
+        if self._failing:
+            self._failing = False
+            logger.info(f"Cache {self.prefix or 'backend'} recovered after {self.errors} errors")
+
+    def _count(self, values):
+        found = sum(v is not None for v in values)
+        self.hits += found
+        self.misses += len(values) - found
+
+    async def get(self, key):
+        return (await self.mget([key]))[0]
+
+    async def mget(self, keys):
+        if not keys:
+            return []
+        try:
+            values = await self.client.mget([self.prefix + key for key in keys])
+            self._succeeded()
+        except Exception as e:
+            self._failed("mget", e)
+            values = [None] * len(keys)
+        self._count(values)
+        return values
+
+    async def set(self, key, value, ttl=None):
+        try:
+            await self.client.set(self.prefix + key, value, px=self._ttl_ms(ttl))
+            self._succeeded()
+        except Exception as e:
+            self._failed("set", e)
+
+    async def delete(self, key):
+        try:
+            await self.client.delete(self.prefix + key)
+            self._succeeded()
+        except Exception as e:
+            self._failed("delete", e)
+
+    async def compare_and_set(self, key, expected, value, ttl=None):
+        ttl_ms = self._ttl_ms(ttl)
+        try:
+            if expected is None:
+                stored = bool(await self.client.set(self.prefix + key, value, px=ttl_ms, nx=True))
+            else:
+                stored = bool(await self._cas(keys=[self.prefix + key], args=[expected, value, ttl_ms or ""]))
+            self._succeeded()
+        except Exception as e:
+            self._failed("compare_and_set", e)
+            return False
+        if not stored:
+            self.cas_conflicts += 1
+        return stored
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "prefix": self.prefix,
+            "default_ttl": self.default_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "cas_conflicts": self.cas_conflicts,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+_caches: Dict[str, CacheBackend] = {}
+_redis_client = None
+
+
+def get_cache(namespace: str, max_bytes: int, default_ttl: Optional[float] = None) -> CacheBackend:
+    """The backend for one cache, created on first use. max_bytes only bounds the memory backend."""
+    global _redis_client
+    if namespace not in _caches:
+        if settings.CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+            if redis is None:
+                raise RuntimeError("CACHE_URL points at Redis but the redis package is not installed")
+            # One connection pool for every namespace
+            if _redis_client is None:
+                _redis_client = redis.from_url(settings.CACHE_URL)
+            _caches[namespace] = RedisCache(_redis_client, prefix=f"familypoints:{namespace}:", default_ttl=default_ttl)
+        else:
+            _caches[namespace] = MemoryCache(max_bytes, default_ttl)
+    return _caches[namespace]
+
+
+async def close_caches():
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
@@ -7,5 +7,36 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60*24*7
     # allow Vite dev server (5173) and older default (3000)
     CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000")
+    # in-process cache of authenticated principals (see app.core.principals)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+    # processes in the bcrypt pool (see app.core.security)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # shared secret for /api/v1/internal monitoring endpoints; unset disables them
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    # connection budget per process, split between the async and sync engines by DB_ASYNC_POOL_SHARE
+    # (see app.db.session and /api/v1/internal/pool before changing these)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_ASYNC_POOL_SHARE: float = float(os.getenv("DB_ASYNC_POOL_SHARE", "0.7"))
+    # pool warmer (see app.db.warmer): open each engine's pool_size connections on startup, then ping them every
+    # DB_KEEPALIVE_SECONDS (0 disables) until DB_KEEPALIVE_IDLE_CUTOFF_SECONDS pass without a request,
+    # after which Neon is allowed to suspend
+    DB_WARM_ON_STARTUP: bool = os.getenv("DB_WARM_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+    DB_KEEPALIVE_SECONDS: float = float(os.getenv("DB_KEEPALIVE_SECONDS", "240"))
+    DB_KEEPALIVE_IDLE_CUTOFF_SECONDS: float = float(os.getenv("DB_KEEPALIVE_IDLE_CUTOFF_SECONDS", "1800"))
+    # keyset pagination on list endpoints (see app.core.pagination)
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "500"))
+    # shared cache backend (see app.core.cache): redis://... for multi-worker deployments, unset for in-process
+    CACHE_URL: str = os.getenv("CACHE_URL", "")
+    # cache of family GET responses (see app.core.response_cache); 0 bytes disables it
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+    # in-process cache of per-family settings and child rosters (see app.core.family)
+    FAMILY_CONTEXT_CACHE_SIZE: int = int(os.getenv("FAMILY_CONTEXT_CACHE_SIZE", "10000"))
+    FAMILY_CONTEXT_TTL_SECONDS: float = float(os.getenv("FAMILY_CONTEXT_TTL_SECONDS", "300"))
+    # statements per request before a warning is logged (see app.db.query_count); 0 disables counting
+    DB_QUERY_BUDGET: int = int(os.getenv("DB_QUERY_BUDGET", "0"))
 
 settings = Settings()
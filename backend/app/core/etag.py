@@ -0,0 +1,73 @@
+"""Conditional GETs for family data.
+
+`family_etag` is a route dependency: it derives a weak ETag from the family's version stamp (see
+app.services.family_versions), the caller and the URL, and answers a matching If-None-Match with
+304 before the endpoint's own queries run. ETagMiddleware puts the tag on the 200 response, since
+many routes return a Response themselves and skip FastAPI's header merging.
+
+Responses with this month's figures use `monthly_family_etag`, whose tag also changes when the
+(UTC) month rolls over, since nothing is written to bump the version then.
+"""
+import zlib
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import get_current_user
+from app.core.principals import Principal
+from app.db.session import get_async_db, release_for_sync_route
+from app.services import family_versions, ledger
+
+
+async def _family_etag(request: Request, db: AsyncSession, current: Principal, scope: str = "") -> Optional[str]:
+    family_id = family_versions.family_of(current)
+    if family_id is None:
+        return None
+    version = await db.run_sync(family_versions.get_version, family_id)
+    await release_for_sync_route(request, db)
+
+    url = f"{request.url.path}?{request.url.query}".encode()
+    etag = f'W/"{family_id}.{version}{scope}.{current.id}.{zlib.crc32(url):x}"'
+    request.state.etag = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    return etag
+
+
+async def family_etag(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current: Principal = Depends(get_current_user),
+) -> Optional[str]:
+    return await _family_etag(request, db, current)
+
+
+async def monthly_family_etag(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current: Principal = Depends(get_current_user),
+) -> Optional[str]:
+    return await _family_etag(request, db, current, ledger.month_start().strftime(".%Y-%m"))
+
+
+class ETagMiddleware:
+    """Adds the ETag that family_etag computed (plus no-cache, so clients revalidate) to 200 responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                if etag:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"etag", etag.encode()))
+                    headers.append((b"cache-control", b"private, no-cache"))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,77 @@
+"""Per-family context: the parent's settings and the child roster, loaded once and cached.
+
+`get_family_context` is the dependency. Entries are evicted through the invalidation bus
+(kind "family") when settings change or a child is added or removed, on every worker, and expire
+after FAMILY_CONTEXT_TTL_SECONDS as a backstop.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import invalidation
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.lru import LRUCache
+from app.core.principals import Principal
+from app.db.session import get_async_db, release_for_sync_route
+from app.models import models
+from app.services import family_versions
+
+
+@dataclass(frozen=True)
+class FamilyContext:
+    parent_id: int
+    settings_id: Optional[int]  # None until the parent first opens their settings
+    points_per_dollar: int
+    monthly_dollar_cap_per_child: float
+    show_money_to_children: bool
+    children: Dict[int, str]  # child id -> name
+
+    def to_money(self, points: int) -> float:
+        return (points / self.points_per_dollar) if self.points_per_dollar > 0 else 0.0
+
+
+# Family contexts keyed by parent id
+family_cache = LRUCache(settings.FAMILY_CONTEXT_CACHE_SIZE, settings.FAMILY_CONTEXT_TTL_SECONDS)
+# Other workers hold their own copies; see app.core.invalidation
+invalidation.subscribe("family", lambda family_id, key: family_cache.invalidate(family_id))
+
+
+async def load_family_context(db: AsyncSession, family_id: int) -> FamilyContext:
+    parent_settings = (await db.execute(
+        select(models.ParentSettings).where(models.ParentSettings.parent_id == family_id)
+    )).scalars().first()
+    children = (await db.execute(
+        select(models.User.id, models.User.name).where(models.User.parent_id == family_id).order_by(models.User.id)
+    )).all()
+    # No settings row yet (or a NULL column) means the column default applies
+    def setting(name):
+        value = getattr(parent_settings, name, None)
+        return models.ParentSettings.__table__.c[name].default.arg if value is None else value
+
+    return FamilyContext(
+        parent_id=family_id,
+        settings_id=parent_settings.id if parent_settings else None,
+        points_per_dollar=setting("points_per_dollar"),
+        monthly_dollar_cap_per_child=setting("monthly_dollar_cap_per_child"),
+        show_money_to_children=setting("show_money_to_children"),
+        children={id: name for id, name in children},
+    )
+
+
+async def get_family_context(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current: Principal = Depends(get_current_user),
+) -> FamilyContext:
+    family_id = family_versions.family_of(current)
+    if family_id is None:
+        raise HTTPException(status_code=400, detail="Child has no parent found")
+    context = family_cache.get(family_id)
+    if context is None:
+        generation = family_cache.generation
+        context = await load_family_context(db, family_id)
+        await release_for_sync_route(request, db)
+        family_cache.put(family_id, context, generation)
+    return context
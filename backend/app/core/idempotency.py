@@ -0,0 +1,103 @@
+"""Idempotency-Key support for POSTs that move points.
+
+A client that retries a redemption or an approval after a timeout can't tell whether the first
+attempt went through. Sending the same Idempotency-Key header on both makes the retry safe: the
+key is claimed with INSERT ... ON CONFLICT DO NOTHING on the endpoint's own session, so the claim
+commits or rolls back together with the ledger write. A request whose key is already claimed
+doesn't run the endpoint; it gets the first request's response back, or 409 while that request is
+still in flight. A request that failed rolled its claim back, so retrying it runs it again.
+
+`idempotent` is the route dependency; IdempotencyMiddleware stores the response once it has been
+sent, the way ResponseCacheMiddleware does. Requests without the header are unaffected.
+"""
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import get_current_user
+from app.core.principals import Principal
+from app.db.session import async_engine, get_async_db
+from app.db.upsert import insert_ignore
+from app.models import models
+
+HEADER = "Idempotency-Key"
+
+
+class ReplayedResponse(Exception):
+    def __init__(self, status_code: int, content_type: Optional[str], body: bytes):
+        self.status_code = status_code
+        self.content_type = content_type
+        self.body = body
+
+
+async def idempotent(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current: Principal = Depends(get_current_user),
+):
+    key = request.headers.get(HEADER)
+    if key is None:
+        return
+    if not key or len(key) > 255:
+        raise HTTPException(status_code=400, detail=f"{HEADER} must be 1 to 255 characters")
+    fingerprint = f"{request.method} {request.url.path}"
+    claimed = await db.run_sync(insert_ignore, models.IdempotencyKey, user_id=current.id, key=key, request=fingerprint)
+    if claimed:
+        request.state.idempotency_key = (current.id, key)
+        return
+
+    first = (await db.execute(select(models.IdempotencyKey).where(
+        models.IdempotencyKey.user_id == current.id,
+        models.IdempotencyKey.key == key,
+    ))).scalar_one()
+    if first.request != fingerprint:
+        raise HTTPException(status_code=422, detail=f"{HEADER} was already used for {first.request}")
+    if first.status_code is None:
+        raise HTTPException(status_code=409, detail=f"A request with this {HEADER} is still in progress")
+    raise ReplayedResponse(first.status_code, first.content_type, first.body)
+
+
+async def replayed_response_handler(request: Request, exc: ReplayedResponse) -> Response:
+    return Response(exc.body, status_code=exc.status_code, media_type=exc.content_type)
+
+
+async def _store(user_id: int, key: str, status_code: int, content_type: Optional[str], body: bytes):
+    # On a connection of its own: a session here would count as a family write and move the ETags
+    async with async_engine.begin() as conn:
+        await conn.execute(update(models.IdempotencyKey).where(
+            models.IdempotencyKey.user_id == user_id,
+            models.IdempotencyKey.key == key,
+        ).values(status_code=status_code, content_type=content_type, body=body))
+
+
+class IdempotencyMiddleware:
+    """Stores the response of requests whose key `idempotent` claimed.
+
+    Sits inside GZipMiddleware so what's stored is the uncompressed body. Error responses are
+    skipped: their unit of work, claim included, was rolled back.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        captured = {}
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                claim = scope.get("state", {}).get("idempotency_key")
+                if claim is not None and message["status"] < 400:
+                    headers = dict(message.get("headers", []))
+                    content_type = headers.get(b"content-type")
+                    captured.update(claim=claim, status=message["status"], chunks=[],
+                                    content_type=content_type.decode("latin-1") if content_type else None)
+            elif message["type"] == "http.response.body" and captured:
+                captured["chunks"].append(message.get("body", b""))
+            await send(message)
+            if message["type"] == "http.response.body" and captured and not message.get("more_body", False):
+                await _store(*captured["claim"], captured["status"], captured["content_type"], b"".join(captured["chunks"]))
+
+        await self.app(scope, receive, send_and_capture)
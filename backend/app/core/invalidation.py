@@ -0,0 +1,174 @@
+"""Invalidation bus that keeps every worker's in-process caches coherent.
+
+A write calls `publish(db, family_id, kind, key)` inside its transaction. On commit the message
+goes out as NOTIFY familypoints_invalidate '<family>:<kind>[:<key>]', which Postgres delivers only
+if the transaction commits, and this worker's subscribers run straight away. Every other worker
+hears it on a listener thread holding its own LISTEN connection. Subscribers register per kind
+with `subscribe(kind, callback)` and get (family_id, key); (None, None) means "drop everything",
+sent when the listener reconnects after missing messages.
+
+On SQLite there is a single process, so messages are only dispatched locally.
+"""
+import logging
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.db.session import IS_SQLITE, engine, pool_metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "familypoints_invalidate"
+
+_subscribers: Dict[str, List[Callable]] = {}
+_listener = None
+_state = {"connected": False, "received": 0, "reconnects": 0, "last_error": None}
+
+
+def subscribe(kind: str, callback: Callable[[Optional[int], Optional[str]], None]):
+    _subscribers.setdefault(kind, []).append(callback)
+
+
+def publish(db, family_id: int, kind: str, key=None):
+    """Queue an invalidation on `db` (Session or AsyncSession); it's sent only if the transaction
+    it was queued in commits."""
+    session = getattr(db, "sync_session", db)
+    # Tie the message to a transaction even if nothing has been read or written yet
+    if not session.in_transaction():
+        session.begin()
+    payload = f"{family_id}:{kind}" if key is None else f"{family_id}:{kind}:{key}"
+    session.info.setdefault("invalidations", set()).add(payload)
+
+
+def _call(kind: str, family_id: Optional[int], key: Optional[str]):
+    for callback in _subscribers.get(kind, []):
+        try:
+            callback(family_id, key)
+        except Exception as e:
+            logger.exception(f"Invalidation subscriber for {kind} failed: {e}")
+
+
+def dispatch(payload: str):
+    try:
+        family, kind, *key = payload.split(":", 2)
+        family_id = int(family)
+    except ValueError:
+        logger.warning(f"Ignoring malformed invalidation {payload!r}")
+        return
+    _call(kind, family_id, key[0] if key else None)
+
+
+def dispatch_all():
+    for kind in list(_subscribers):
+        _call(kind, None, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify(session):
+    if IS_SQLITE:
+        return
+    for payload in session.info.get("invalidations", ()):
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_local(session):
+    # Our own NOTIFY also comes back through the listener; evicting twice is harmless
+    for payload in session.info.pop("invalidations", ()):
+        dispatch(payload)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard(session, transaction):
+    # Runs after after_commit has taken the messages, so anything left belongs to a transaction
+    # that was rolled back or closed uncommitted (even one that never reached the database)
+    if transaction.parent is None:
+        session.info.pop("invalidations", None)
+
+
+class _Listener(threading.Thread):
+    """LISTENs on a dedicated connection outside the pool.
+
+    If the connection drops (e.g. Neon suspended the compute), every cache is flushed and the
+    listener waits for request traffic before reconnecting, so it never wakes the database itself.
+    """
+
+    def __init__(self):
+        super().__init__(name="invalidation-listener", daemon=True)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _traffic_since(self, since: float) -> bool:
+        return any((m.last_request_checkout or 0) > since for m in pool_metrics.values())
+
+    def _connect(self):
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        conn = engine.dialect.dbapi.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def run(self):
+        conn, dropped_at = None, None
+        while not self._stop_event.is_set():
+            if conn is None:
+                if dropped_at is not None and not self._traffic_since(dropped_at):
+                    self._stop_event.wait(1)
+                    continue
+                try:
+                    conn = self._connect()
+                except Exception as e:
+                    _state["last_error"] = str(e)
+                    dropped_at = time.monotonic()
+                    self._stop_event.wait(5)
+                    continue
+                _state["connected"] = True
+                if dropped_at is not None:
+                    # Anything published while we were away was missed
+                    _state["reconnects"] += 1
+                    logger.info("Invalidation listener reconnected; dropping every cached entry")
+                    dispatch_all()
+            try:
+                if select.select([conn], [], [], 1)[0]:
+                    conn.poll()
+                    while conn.notifies:
+                        _state["received"] += 1
+                        dispatch(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Invalidation listener lost its connection: {e}")
+                _state.update(connected=False, last_error=str(e))
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                conn, dropped_at = None, time.monotonic()
+                dispatch_all()
+        if conn is not None:
+            conn.close()
+        _state["connected"] = False
+
+
+def start():
+    global _listener
+    if IS_SQLITE:
+        return  # one process; local dispatch is enough
+    if _listener is None:
+        _listener = _Listener()
+        _listener.start()
+
+
+def stop():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener.join(timeout=5)
+        _listener = None
+
+
+def stats() -> dict:
+    return {**_state, "listening": _listener is not None, "kinds": sorted(_subscribers)}
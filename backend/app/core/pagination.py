@@ -0,0 +1,64 @@
+"""Keyset pagination on (created_at, id) for list endpoints.
+
+Pages continue from the last row seen instead of using OFFSET, so with an index ending in
+(created_at, id) a deep page costs the same as the first. Bodies are `{"items": [...],
+"next_cursor": ...}` (schemas.Paginated); next_cursor is null on the last page.
+"""
+import base64
+import datetime
+import json
+from collections.abc import Mapping
+from typing import Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+from app.core.config import settings
+
+def encode_cursor(created_at: datetime.datetime, id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class Page:
+    """Dependency: `page: Page = Depends()`, then `page.apply(query, ...)`, `page.trim(rows)`
+    and `page.wrap(items)` for the response body.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.after = decode_cursor(cursor) if cursor else None
+        self.next_cursor = None
+
+    def apply(self, query, created_at, id, descending: bool = True):
+        key = tuple_(created_at, id)
+        if self.after:
+            query = query.where(key < self.after if descending else key > self.after)
+        order = (created_at.desc(), id.desc()) if descending else (created_at.asc(), id.asc())
+        # One extra row tells us whether there is a next page
+        return query.order_by(*order).limit(self.limit + 1)
+
+    def trim(self, rows):
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            if isinstance(last, Mapping):
+                self.next_cursor = encode_cursor(last["created_at"], last["id"])
+            else:
+                self.next_cursor = encode_cursor(last.created_at, last.id)
+        return rows
+
+    def wrap(self, items) -> dict:
+        return {"items": items, "next_cursor": self.next_cursor}
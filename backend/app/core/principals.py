@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Optional
+from app.core import invalidation
+from app.core.config import settings
+from app.core.lru import LRUCache
+from app.models import models
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user, as much as authorization needs."""
+    id: int
+    role: models.RoleEnum
+    parent_id: Optional[int] = None
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(id=user.id, role=user.role, parent_id=user.parent_id)
+
+
+# Principal snapshots keyed by user id (the token subject)
+principal_cache = LRUCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def _on_invalidate(family_id: Optional[int], user_id: Optional[str]):
+    principal_cache.invalidate(None if user_id is None else int(user_id))
+
+
+# Other workers hold their own copies; see app.core.invalidation
+invalidation.subscribe("principal", _on_invalidate)
@@ -0,0 +1,95 @@
+"""Response cache for read-heavy family GETs.
+
+Entries are keyed by the URL and the ETag from app.core.etag, which already folds in the family,
+its version and the caller. Every write by a family member bumps the version, so a stale entry is
+simply never asked for again and ages out (LRU in memory, TTL in Redis); nothing is invalidated by
+hand.
+
+`cached_response` is a route dependency: on a hit it raises CachedResponse, which
+`cached_response_handler` turns into the stored response before the endpoint runs. On a miss it
+marks the request, and ResponseCacheMiddleware stores the endpoint's 200 body on the way out.
+Routes with this month's figures use `cached_monthly_response`, keyed by the month as well.
+"""
+import orjson
+from typing import Optional
+from fastapi import Depends, Request, Response
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.etag import family_etag, monthly_family_etag
+
+# Response headers worth replaying; CORS, ETag and encoding headers are added fresh on every hit
+_KEPT_HEADERS = {b"content-type"}
+
+# Shared across workers when CACHE_URL points at Redis (see app.core.cache)
+response_cache = get_cache("responses", settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def _pack(body: bytes, headers) -> bytes:
+    return orjson.dumps([[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers]) + b"\n" + body
+
+
+def _unpack(entry: bytes):
+    headers, body = entry.split(b"\n", 1)
+    return body, [(k.encode("latin-1"), v.encode("latin-1")) for k, v in orjson.loads(headers)]
+
+
+class CachedResponse(Exception):
+    def __init__(self, body: bytes, headers):
+        self.body = body
+        self.headers = headers
+
+
+async def _lookup(request: Request, etag: Optional[str]):
+    if etag is None or settings.RESPONSE_CACHE_MAX_BYTES <= 0:
+        return
+    key = f"{etag}{request.url.path}?{request.url.query}"
+    hit = await response_cache.get(key)
+    if hit is not None:
+        raise CachedResponse(*_unpack(hit))
+    request.state.response_cache_key = key
+
+
+async def cached_response(request: Request, etag: Optional[str] = Depends(family_etag)):
+    await _lookup(request, etag)
+
+
+async def cached_monthly_response(request: Request, etag: Optional[str] = Depends(monthly_family_etag)):
+    await _lookup(request, etag)
+
+
+async def cached_response_handler(request: Request, exc: CachedResponse) -> Response:
+    response = Response(exc.body)
+    response.raw_headers.extend(exc.headers)
+    return response
+
+
+class ResponseCacheMiddleware:
+    """Stores the 200 body of requests that cached_response marked as misses.
+
+    Sits inside GZipMiddleware so what's stored is the uncompressed body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        captured = {}
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                key = scope.get("state", {}).get("response_cache_key")
+                if key is not None and message["status"] == 200:
+                    captured.update(key=key, chunks=[], headers=[
+                        (k, v) for k, v in message.get("headers", []) if k.lower() in _KEPT_HEADERS
+                    ])
+            elif message["type"] == "http.response.body" and captured:
+                captured["chunks"].append(message.get("body", b""))
+            await send(message)
+            if message["type"] == "http.response.body" and captured and not message.get("more_body", False):
+                entry = _pack(b"".join(captured["chunks"]), captured["headers"])
+                await response_cache.set(captured["key"], entry)
+
+        await self.app(scope, receive, send_and_capture)
@@ -1,5 +1,8 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -13,6 +16,35 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt is deliberately slow and holds the GIL, so request paths hash on a small
+# dedicated process pool instead of the shared anyio worker threads. Workers are spawned, not
+# forked: a fork of this multi-threaded process can inherit locks held by other threads
+_hash_executor: Optional[ProcessPoolExecutor] = None
+
+def _executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_executor
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_executor(), get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_executor(), verify_password, plain_password, hashed_password)
+
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    # For sync callers (seeding): hashes in parallel on the pool
+    return list(_executor().map(get_password_hash, passwords))
+
+def shutdown_hash_executor():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     now = datetime.utcnow()
     if expires_delta:
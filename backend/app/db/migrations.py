@@ -0,0 +1,32 @@
+import os
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def head_revision() -> str:
+    # Reads the revision files on disk; no database access
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def check_schema_revision(engine) -> str:
+    """Compare the database's alembic_version with the code's head revision, in one query.
+
+    Raises SchemaOutOfDate if they differ; migrations are applied out of band with `alembic upgrade head`.
+    """
+    head = head_revision()
+    try:
+        with engine.connect() as conn:
+            current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        current = None  # alembic_version doesn't exist: never migrated
+    if current != head:
+        raise SchemaOutOfDate(f"Database schema is at revision {current}, this build needs {head}. Run `alembic upgrade head`.")
+    return current
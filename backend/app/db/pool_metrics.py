@@ -0,0 +1,127 @@
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Set while the pool warmer pings, so its checkouts don't count as traffic
+keepalive_ping = ContextVar("keepalive_ping", default=False)
+
+
+class Histogram:
+    """Bucketed latency samples in milliseconds. Not locked; PoolMetrics holds its lock around it."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))] += 1
+
+    def stats(self) -> dict:
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": (self.total_ms / self.count) if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class PoolMetrics:
+    """Checkout wait, connect latency and hold time (checkout -> checkin) for one engine's pool.
+
+    Build the engine with poolclass=metrics.pool_class(...) so checkout waits are timed, then attach().
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._lock = threading.Lock()
+        self.wait = Histogram()
+        self.connect = Histogram()
+        self.hold = Histogram()
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.last_request_checkout = None  # time.monotonic() of the last non-keepalive checkout
+
+    def pool_class(self, base):
+        metrics = self
+
+        class InstrumentedPool(base):
+            # _do_get is where a checkout blocks: waiting for a free slot, or opening an overflow connection
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                finally:
+                    metrics._observe(metrics.wait, started)
+
+        InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def attach(self, engine):
+        self.engine = engine
+        event.listen(engine, "do_connect", self._on_do_connect)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        return self
+
+    def _observe(self, histogram, started):
+        ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            histogram.observe(ms)
+
+    def _on_do_connect(self, dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started_at"] = time.perf_counter()
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started_at", None)
+        if started is not None:
+            self._observe(self.connect, started)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            if not keepalive_ping.get():
+                self.last_request_checkout = time.monotonic()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        with self._lock:
+            self.checked_out -= 1
+        self._observe(self.hold, started)
+
+    def reset(self):
+        with self._lock:
+            self.peak_checked_out = self.checked_out
+            for histogram in (self.wait, self.connect, self.hold):
+                histogram.reset()
+
+    def stats(self) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),  # QueuePool counts up from -pool_size
+                "peak_checked_out": self.peak_checked_out,
+                "wait_ms": self.wait.stats(),
+                "connect_ms": self.connect.stats(),
+                "hold_ms": self.hold.stats(),
+            }
@@ -0,0 +1,47 @@
+"""Counts SQL statements per request, so an N+1 shows up as a number that grows with the list.
+
+Both engines are attached in app.db.session. Counters are plain objects held in a ContextVar, so
+statements run from the threadpool (sync routes) or SQLAlchemy's greenlets (async routes) land in
+the request that issued them.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+_active = ContextVar("query_counters", default=())
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active.get():
+        counter.count += 1
+        counter.statements.append(statement)
+
+
+def attach(engine):
+    event.listen(engine, "before_cursor_execute", _on_execute)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    token = _active.set(_active.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fails if the block runs more than `limit` statements, e.g. around a TestClient call."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {s}" for s in counter.statements)
+        raise AssertionError(f"{counter.count} queries, expected at most {limit}:\n{listing}")
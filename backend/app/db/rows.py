@@ -0,0 +1,43 @@
+"""Core read path for read-only list endpoints.
+
+Selecting plain columns and handing the row mappings straight to RowsResponse skips ORM identity
+mapping, per-row pydantic validation and jsonable_encoder, which dominate on long lists. Endpoints keep their
+response_model for the OpenAPI docs; FastAPI doesn't validate a Response returned directly, so the
+selected columns are derived from that same schema.
+"""
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def columns(model, schema=None):
+    """Columns of `model` that `schema` declares (nested fields are left to the caller); all when no schema."""
+    table = model.__table__
+    if schema is None:
+        return list(table.c)
+    return [table.c[name] for name in schema.__fields__ if name in table.c]
+
+
+def group_by(rows: Iterable[Dict[str, Any]], key: str, drop_key: bool = True) -> Dict[Any, List[dict]]:
+    """Child rows keyed by their parent id, for attaching nested lists from a second query."""
+    grouped = defaultdict(list)
+    for row in rows:
+        row = dict(row)
+        parent_id = row.pop(key) if drop_key else row[key]
+        grouped[parent_id].append(row)
+    return grouped
+
+
+def _default(value):
+    if isinstance(value, Mapping):  # RowMapping
+        return dict(value)
+    raise TypeError
+
+
+class RowsResponse(ORJSONResponse):
+    """Renders row mappings (or dicts built from them) without a pydantic round trip."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,28 +1,190 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+from typing import Tuple
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.db import query_count
+from app.db.pool_metrics import PoolMetrics
+
+# DATABASE_URL=sqlite:///path/to.db runs the API on a local file (dev, load tests, CI) with both
+# engines sharing it. In-memory SQLite isn't supported: each connection would see its own database.
+IS_SQLITE = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers don't block the writer (persists in the file)
+    "PRAGMA synchronous=NORMAL",  # fsync at checkpoints rather than every commit; safe under WAL
+    "PRAGMA foreign_keys=ON",  # enforce FKs the way Postgres does
+    "PRAGMA busy_timeout=30000",  # wait for the write lock instead of failing with "database is locked"
+    "PRAGMA cache_size=-65536",  # 64MB page cache per connection
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def split_budget(total: int, async_share: float, minimum: int) -> Tuple[int, int]:
+    """(async, sync) shares of a connection count; each engine gets at least `minimum`."""
+    async_part = max(minimum, round(total * async_share))
+    return async_part, max(minimum, total - async_part)
+
+
+# One connection budget per process: at most DB_POOL_SIZE + DB_MAX_OVERFLOW across both engines
+# (plus the invalidation listener's LISTEN connection), however the routers are split between them.
+# Most routers are async, so the async engine gets DB_ASYNC_POOL_SHARE of it.
+ASYNC_POOL_SIZE, SYNC_POOL_SIZE = split_budget(settings.DB_POOL_SIZE, settings.DB_ASYNC_POOL_SHARE, 1)
+ASYNC_MAX_OVERFLOW, SYNC_MAX_OVERFLOW = split_budget(settings.DB_MAX_OVERFLOW, settings.DB_ASYNC_POOL_SHARE, 0)
 
 # Configure engine with settings optimized for Neon (serverless Postgres)
 # - pool_pre_ping: Tests connections before use, helps wake up suspended DBs
 # - connect_args: Increase timeout to allow Neon to wake from suspension
 # NOTE: Don't use "options" parameter with Neon pooled connections (PgBouncer doesn't support it)
+# Pool wait/connect/hold times are recorded per engine and served at /api/v1/internal/pool
+sync_pool_metrics = PoolMetrics()
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=sync_pool_metrics.pool_class(QueuePool),
     pool_pre_ping=True,  # Verify connection is alive before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=SYNC_POOL_SIZE,
+    max_overflow=SYNC_MAX_OVERFLOW,
     pool_timeout=30,  # Wait up to 30s for a connection from pool
+    connect_args=(
+        # sqlite3's "timeout" is the lock wait; pooled connections move between threadpool threads
+        {"timeout": 30, "check_same_thread": False} if IS_SQLITE
+        else {"connect_timeout": 30}  # Allow 30s for Neon to wake up
+    )
+)
+sync_pool_metrics.attach(engine)
+query_count.attach(engine)
+# expire_on_commit=False: SessionRoute closes the session before the response is serialized,
+# so objects returned after a commit must keep their loaded state
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+Base = declarative_base()
+
+
+def async_database_url(database_url: str) -> URL:
+    """Map DATABASE_URL (psycopg2 style) onto the asyncpg driver, or aiosqlite for SQLite.
+
+    asyncpg takes ``ssl`` rather than libpq's ``sslmode`` and rejects other libpq-only
+    query options that Neon connection strings carry.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    query.pop("channel_binding", None)
+    if sslmode and sslmode != "disable":
+        query["ssl"] = sslmode
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+# Async engine for the async routers. Its share of the pool budget, and the same Neon wake-up allowance;
+# asyncpg spells connect_timeout as "timeout" (for aiosqlite it's the lock wait, as above).
+async_pool_metrics = PoolMetrics()
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    poolclass=async_pool_metrics.pool_class(AsyncAdaptedQueuePool),
+    pool_pre_ping=True,
+    pool_size=ASYNC_POOL_SIZE,
+    max_overflow=ASYNC_MAX_OVERFLOW,
+    pool_timeout=30,
     connect_args={
-        "connect_timeout": 30,  # Allow 30s for Neon to wake up
+        "timeout": 30,
     }
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+async_pool_metrics.attach(async_engine.sync_engine)
+query_count.attach(async_engine.sync_engine)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+# expire_on_commit=False: attribute access after commit must not trigger implicit (sync) IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-# Dependency
+pool_metrics = {"sync": sync_pool_metrics, "async": async_pool_metrics}
+
+# Dependency. Sessions only check out a connection on their first statement.
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def release_for_sync_route(request: Request, db: AsyncSession):
+    """For dependencies that read through the request's AsyncSession before the endpoint runs.
+
+    A sync endpoint queries on its own Session, so the async connection is handed back now rather
+    than held until the request ends. An async endpoint shares this session (FastAPI caches the
+    dependency), so it keeps the connection and skips a second checkout and pre-ping.
+    """
+    route = request.scope.get("route")
+    if not asyncio.iscoroutinefunction(getattr(route, "endpoint", None)):
+        await db.close()
+
+
+def _sessions(values: dict):
+    return [v for v in values.values() if isinstance(v, (Session, AsyncSession))]
+
+
+class SessionRoute(APIRoute):
+    """APIRoute that runs each request as one unit of work.
+
+    The endpoint only adds and flushes; when it returns, its DB session is committed once and
+    closed, before the response is serialized. Dependency teardown would otherwise hold the
+    connection while pydantic walks the result. If the endpoint raises, nothing is committed.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        call = self.dependant.call
+
+        if asyncio.iscoroutinefunction(call):
+            async def unit_of_work(**values):
+                sessions = _sessions(values)
+                try:
+                    result = await call(**values)
+                    for db in sessions:
+                        if db.in_transaction():
+                            if isinstance(db, AsyncSession):
+                                await db.commit()
+                            else:
+                                await run_in_threadpool(db.commit)
+                    return result
+                finally:
+                    for db in sessions:
+                        if isinstance(db, AsyncSession):
+                            await db.close()
+                        else:
+                            await run_in_threadpool(db.close)
+        else:
+            def unit_of_work(**values):
+                # Sync endpoints only ever get sync sessions
+                sessions = [db for db in _sessions(values) if isinstance(db, Session)]
+                try:
+                    result = call(**values)
+                    for db in sessions:
+                        if db.in_transaction():
+                            db.commit()
+                    return result
+                finally:
+                    for db in sessions:
+                        db.close()
+
+        self.dependant.call = unit_of_work
@@ -0,0 +1,14 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(db, model):
+    """insert() construct for the session's dialect, so callers can use on_conflict_do_nothing()."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def insert_ignore(db, model, **values) -> bool:
+    """Single-statement INSERT ... ON CONFLICT DO NOTHING. Returns True if a row was inserted."""
+    result = db.execute(dialect_insert(db, model).values(**values).on_conflict_do_nothing())
+    return result.rowcount == 1
@@ -0,0 +1,96 @@
+"""Keeps the connection pools (and the Neon compute behind them) awake while traffic is expected.
+
+On startup each pool opens its pool_size connections (its share of DB_POOL_SIZE), so the first
+request after a deploy doesn't pay for Neon's wake-up. Every DB_KEEPALIVE_SECONDS the same connections are pinged, until
+DB_KEEPALIVE_IDLE_CUTOFF_SECONDS pass without a request checkout; then the warmer stays quiet and
+lets Neon suspend, and the next request pays the wake-up as before.
+"""
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.pool_metrics import keepalive_ping
+from app.db.session import ASYNC_POOL_SIZE, IS_SQLITE, SYNC_POOL_SIZE, async_engine, engine, pool_metrics
+
+logger = logging.getLogger(__name__)
+
+_task = None
+_started_at = time.monotonic()
+_state = {"pings": 0, "failures": 0, "last_ping_at": None, "last_ping_ms": None, "last_error": None}
+
+
+def _ping_sync(n: int):
+    keepalive_ping.set(True)
+    # Hold all n at once so n distinct pooled connections get opened/pinged
+    with ExitStack() as stack:
+        for conn in [stack.enter_context(engine.connect()) for _ in range(n)]:
+            conn.execute(text("SELECT 1"))
+
+
+async def _ping_async(n: int):
+    keepalive_ping.set(True)
+    async with AsyncExitStack() as stack:
+        conns = [await stack.enter_async_context(async_engine.connect()) for _ in range(n)]
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+
+
+async def ping():
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(run_in_threadpool(_ping_sync, SYNC_POOL_SIZE), _ping_async(ASYNC_POOL_SIZE))
+        _state["pings"] += 1
+        _state["last_error"] = None
+    except Exception as e:
+        _state["failures"] += 1
+        _state["last_error"] = str(e)
+        logger.warning(f"Pool warmer ping failed: {e}")
+    _state["last_ping_at"] = time.time()
+    _state["last_ping_ms"] = (time.perf_counter() - started) * 1000
+
+
+def idle_seconds() -> float:
+    seen = [m.last_request_checkout for m in pool_metrics.values() if m.last_request_checkout is not None]
+    return time.monotonic() - max(seen + [_started_at])
+
+
+async def _run():
+    if settings.DB_WARM_ON_STARTUP:
+        await ping()
+    if settings.DB_KEEPALIVE_SECONDS <= 0:
+        return
+    while True:
+        await asyncio.sleep(settings.DB_KEEPALIVE_SECONDS)
+        if idle_seconds() < settings.DB_KEEPALIVE_IDLE_CUTOFF_SECONDS:
+            await ping()
+
+
+def start():
+    global _task
+    if IS_SQLITE:
+        return  # nothing to wake up
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_run())
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+
+def stats() -> dict:
+    return {
+        **_state,
+        "idle_seconds": idle_seconds(),
+        "keepalive_seconds": settings.DB_KEEPALIVE_SECONDS,
+        "idle_cutoff_seconds": settings.DB_KEEPALIVE_IDLE_CUTOFF_SECONDS,
+    }
@@ -1,10 +1,23 @@
+import logging
 import os
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from app.core import invalidation
+from app.core.etag import ETagMiddleware
+from app.core.idempotency import IdempotencyMiddleware, ReplayedResponse, replayed_response_handler
+from app.core.response_cache import CachedResponse, ResponseCacheMiddleware, cached_response_handler
+from app.db import migrations, query_count, warmer
+from app.db.session import engine
 from app.seed import seed_data
+from app.services import badges
+from app.core.config import settings as app_settings
 
-app = FastAPI(title="FamilyPoints API")
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="FamilyPoints API", default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:3000",
@@ -22,11 +35,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added innermost first: the caches store bodies before ETag/gzip touch them
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(ETagMiddleware)
+# Lists and summaries are JSON that compresses ~10x; tiny bodies aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_exception_handler(CachedResponse, cached_response_handler)
+app.add_exception_handler(ReplayedResponse, replayed_response_handler)
+
+if app_settings.DB_QUERY_BUDGET > 0:
+    # Dev aid: list sizes shouldn't change the count; a route over budget usually has an N+1
+    @app.middleware("http")
+    async def count_queries(request: Request, call_next):
+        with query_count.count_queries() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        if counter.count > app_settings.DB_QUERY_BUDGET:
+            logger.warning(f"{request.method} {request.url.path} ran {counter.count} queries (budget {app_settings.DB_QUERY_BUDGET})")
+        return response
 
 from fastapi.staticfiles import StaticFiles
 
 # include routers
-from app.api.v1 import auth, children, tasks, submissions, points, settings, rewards, users, uploads, announcements
+from app.api.v1 import auth, children, tasks, submissions, points, settings, rewards, users, uploads, announcements, internal
 
 # Mount static directory for uploads
 os.makedirs("static/uploads", exist_ok=True)
@@ -42,38 +74,36 @@ app.include_router(settings.router, prefix="/api/v1/settings")
 app.include_router(rewards.router, prefix="/api/v1/rewards")
 app.include_router(uploads.router, prefix="/api/v1/uploads")
 app.include_router(announcements.router, prefix="/api/v1/announcements")
+app.include_router(internal.router, prefix="/api/v1/internal", include_in_schema=False)
 
 @app.on_event("startup")
 def on_startup():
-    from sqlalchemy import text
-    print("Running startup migrations...")
-    
-    # Create all tables that don't exist
-    Base.metadata.create_all(bind=engine)
-    
-    # Manually add columns that might be missing in production (Neon)
-    with engine.connect() as conn:
-        try:
-            # 1. Add evidence_file_path to submissions if missing
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name='submissions' AND column_name='evidence_file_path';
-            """))
-            if not result.fetchone():
-                print("Adding 'evidence_file_path' column to 'submissions' table...")
-                conn.execute(text("ALTER TABLE submissions ADD COLUMN evidence_file_path VARCHAR;"))
-                conn.commit()
-                print("Column added successfully.")
-            
-            # Add any other missing columns for future features here
-            
-        except Exception as e:
-            print(f"Startup migration error: {e}")
+    # Schema changes ship as Alembic revisions applied out of band (`alembic upgrade head`);
+    # boot only checks that the database is at this build's revision
+    started = time.perf_counter()
+    revision = migrations.check_schema_revision(engine)
+    logger.info(f"Schema at revision {revision}, checked in {(time.perf_counter() - started) * 1000:.0f}ms")
 
     if os.getenv("SEED_DB", "false").lower() in ("1", "true", "yes"):
         seed_data()
 
+    # Badge ids for awarding, read once from the rows the migration seeded
+    badges.load_catalog()
+
+    # Opens the pools in the background so boot doesn't wait on Neon waking up
+    warmer.start()
+    # Evicts this worker's caches when another worker commits a write
+    invalidation.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    from app.core import security
+    from app.core.cache import close_caches
+    await warmer.stop()
+    invalidation.stop()
+    await close_caches()
+    security.shutdown_hash_executor()
+
 @app.get("/")
 def read_root():
     return {"status": "ok"}
@@ -1,6 +1,6 @@
 import enum
 import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum, Text, Float, LargeBinary, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -33,6 +33,7 @@ class RewardRedemptionStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_parent_created_id", "parent_id", "created_at", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=True)
@@ -47,6 +48,11 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_parent_active_category", "parent_id", "is_active", "category"),
+        # Keyset pages (see app.core.pagination) walk (created_at, id) within a parent
+        Index("ix_tasks_parent_created_id", "parent_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     parent_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
@@ -61,6 +67,14 @@ class Task(Base):
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_child_created_id", "child_id", "created_at", "id"),
+        # Review queue: only pending rows, which stay a small slice of the table
+        Index(
+            "ix_submissions_pending_child_created", "child_id", "created_at",
+            postgresql_where=text("status = 'PENDING'"), sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -80,6 +94,7 @@ class Submission(Base):
 
 class SubmissionEvidence(Base):
     __tablename__ = "submission_evidence"
+    __table_args__ = (Index("ix_submission_evidence_submission_id", "submission_id"),)
     id = Column(Integer, primary_key=True, index=True)
     submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False)
     file_path = Column(String, nullable=False)
@@ -90,6 +105,7 @@ class SubmissionEvidence(Base):
 
 class PointsLedger(Base):
     __tablename__ = "points_ledger"
+    __table_args__ = (Index("ix_points_ledger_child_created", "child_id", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     delta_points = Column(Integer, nullable=False)
@@ -98,6 +114,65 @@ class PointsLedger(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     created_by_parent_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+class ChildBalance(Base):
+    # Running totals over points_ledger, maintained by app.services.ledger on every insert
+    __tablename__ = "child_balances"
+    child_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    balance = Column(Integer, nullable=False, default=0)
+    lifetime_xp = Column(Integer, nullable=False, default=0)
+    last_ledger_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+class ChildMonthlyPoints(Base):
+    # Per-month rollup of points_ledger, keyed by the first day of the (UTC) month
+    __tablename__ = "child_monthly_points"
+    child_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    earned = Column(Integer, nullable=False, default=0)
+    spent = Column(Integer, nullable=False, default=0)
+    refunded = Column(Integer, nullable=False, default=0)
+
+    @property
+    def net_points(self) -> int:
+        return (self.earned or 0) - (self.spent or 0) + (self.refunded or 0)
+
+class ChildStats(Base):
+    # Approval counters for badge criteria, maintained by app.services.stats on approve
+    __tablename__ = "child_stats"
+    child_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    faith_approved = Column(Integer, nullable=False, default=0)
+    school_approved = Column(Integer, nullable=False, default=0)
+    home_approved = Column(Integer, nullable=False, default=0)
+    kindness_approved = Column(Integer, nullable=False, default=0)
+    other_approved = Column(Integer, nullable=False, default=0)
+    faith_days = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+class ChildFaithDay(Base):
+    # Distinct days with an approved FAITH submission; backs ChildStats.faith_days
+    __tablename__ = "child_faith_days"
+    child_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+class FamilyVersion(Base):
+    # Bumped in the same transaction as any write by a family member (app.services.family_versions);
+    # GET endpoints derive their ETags from it. The family is keyed by the parent's user id.
+    __tablename__ = "family_versions"
+    parent_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class IdempotencyKey(Base):
+    # Claimed in the same transaction as the write it guards (app.core.idempotency); the response
+    # is stored once it has been sent, so a retry with the same key gets it back
+    __tablename__ = "idempotency_keys"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request = Column(String, nullable=False)  # method and path, e.g. "POST /api/v1/rewards/3/redeem"
+    status_code = Column(Integer)
+    content_type = Column(String)
+    body = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
 class ParentSettings(Base):
     __tablename__ = "parent_settings"
     id = Column(Integer, primary_key=True, index=True)
@@ -110,6 +185,14 @@ class ParentSettings(Base):
 
 class Reward(Base):
     __tablename__ = "rewards"
+    __table_args__ = (
+        Index(
+            "ix_rewards_active_parent_created_id", "parent_id", "created_at", "id",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active"),
+        ),
+        # Redemption queues join every reward of the parent, active or not
+        Index("ix_rewards_parent_id", "parent_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     parent_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
@@ -122,6 +205,12 @@ class Reward(Base):
 
 class RewardRedemption(Base):
     __tablename__ = "reward_redemptions"
+    __table_args__ = (
+        Index(
+            "ix_reward_redemptions_requested_reward", "reward_id",
+            postgresql_where=text("status = 'REQUESTED'"), sqlite_where=text("status = 'REQUESTED'"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     reward_id = Column(Integer, ForeignKey("rewards.id"), nullable=False)
@@ -145,6 +234,7 @@ class Badge(Base):
 
 class ChildBadge(Base):
     __tablename__ = "child_badges"
+    __table_args__ = (UniqueConstraint("child_id", "badge_id", name="uq_child_badges_child_badge"),)
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     badge_id = Column(Integer, ForeignKey("badges.id"), nullable=False)
@@ -152,6 +242,7 @@ class ChildBadge(Base):
 
 class Announcement(Base):
     __tablename__ = "announcements"
+    __table_args__ = (Index("ix_announcements_parent_created_id", "parent_id", "created_at", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     parent_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     message = Column(Text, nullable=False)
@@ -163,6 +254,7 @@ class Announcement(Base):
 
 class AnnouncementRead(Base):
     __tablename__ = "announcement_reads"
+    __table_args__ = (UniqueConstraint("announcement_id", "child_id", name="uq_announcement_reads_announcement_child"),)
     id = Column(Integer, primary_key=True, index=True)
     announcement_id = Column(Integer, ForeignKey("announcements.id"), nullable=False)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -173,6 +265,11 @@ class AnnouncementRead(Base):
 
 class AnnouncementDismissal(Base):
     __tablename__ = "announcement_dismissals"
+    __table_args__ = (
+        UniqueConstraint("announcement_id", "child_id", name="uq_announcement_dismissals_announcement_child"),
+        # The child's announcement list filters out their dismissals
+        Index("ix_announcement_dismissals_child_id", "child_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     announcement_id = Column(Integer, ForeignKey("announcements.id"), nullable=False)
     child_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,8 +1,16 @@
-from typing import Optional, List
+from typing import Generic, Optional, List, TypeVar
 from pydantic import BaseModel
+from pydantic.generics import GenericModel
 import datetime
 from enum import Enum
 
+T = TypeVar("T")
+
+class Paginated(GenericModel, Generic[T]):
+    # One page of a list endpoint; pass next_cursor back as ?cursor= for the next one (see app.core.pagination)
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 class Role(str, Enum):
     PARENT = "PARENT"
     CHILD = "CHILD"
@@ -78,6 +86,21 @@ class SubmissionOut(BaseModel):
     class Config:
         orm_mode = True
 
+class ReviewAction(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+
+class SubmissionReviewItem(BaseModel):
+    id: int
+    action: ReviewAction
+
+class SubmissionBatchReview(BaseModel):
+    items: List[SubmissionReviewItem]
+
+class SubmissionBatchResult(BaseModel):
+    approved: List[int]
+    rejected: List[int]
+
 class PointsSummary(BaseModel):
     totalPoints: int
     totalMoneyEquivalent: float
@@ -0,0 +1,50 @@
+"""Precompiled serializers for the hot response schemas.
+
+FastAPI validates every returned ORM object against response_model and then walks the result again
+in jsonable_encoder. For data that just came out of the database that's pure overhead, so
+`serializer(Schema)` generates, once per schema, a function that reads the schema's fields off an
+ORM object into a dict orjson can encode as is (datetimes and enums included). Routes return
+`response(Schema, data)` and keep response_model for the docs. Values are not coerced, so this is
+only for objects whose attributes already have the schema's types.
+"""
+from functools import lru_cache
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST
+from app.schemas import schemas
+
+
+def _is_model(type_) -> bool:
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+@lru_cache(maxsize=None)
+def serializer(schema):
+    namespace, items = {}, []
+    for i, (name, field) in enumerate(schema.__fields__.items()):
+        namespace[f"_default{i}"] = field.default
+        value = f"o.{name}" if field.required else f"getattr(o, {name!r}, _default{i})"
+        if _is_model(field.type_):
+            namespace[f"_dump{i}"] = serializer(field.type_)
+            if field.shape == SHAPE_LIST:
+                value = f"[_dump{i}(x) for x in {value}]"
+            else:
+                value = f"(None if (_v := {value}) is None else _dump{i}(_v))"
+        items.append(f"{name!r}: {value}")
+    source = f"def dump(o):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {schema.__name__}>", "exec"), namespace)
+    return namespace["dump"]
+
+
+def response(schema, data, page=None, **kwargs) -> ORJSONResponse:
+    """`data` is one ORM object or a list of them; with `page`, the list is one page of a list endpoint."""
+    dump = serializer(schema)
+    content = [dump(o) for o in data] if isinstance(data, list) else dump(data)
+    if page is not None:
+        content = page.wrap(content)
+    return ORJSONResponse(content, **kwargs)
+
+
+# Built at import so the first request doesn't pay for it
+for _schema in (schemas.SubmissionOut, schemas.TaskOut, schemas.RewardOut, schemas.AnnouncementOut):
+    serializer(_schema)
@@ -1,6 +1,6 @@
 from app.db.session import SessionLocal
 from app.models import models
-from app.core.security import get_password_hash
+from app.core.security import get_password_hashes
 
 
 def seed_data():
@@ -9,12 +9,13 @@ def seed_data():
         p = db.query(models.User).filter(models.User.email=="parent@example.com").first()
         if p:
             return
-        parent = models.User(name="Parent Example", email="parent@example.com", password_hash=get_password_hash("password"), role=models.RoleEnum.PARENT)
+        parent_hash, c1_hash, c2_hash = get_password_hashes(["password", "password", "password"])
+        parent = models.User(name="Parent Example", email="parent@example.com", password_hash=parent_hash, role=models.RoleEnum.PARENT)
         db.add(parent)
         db.commit()
         db.refresh(parent)
-        c1 = models.User(name="Selina", username="selina", password_hash=get_password_hash("password"), role=models.RoleEnum.CHILD, parent_id=parent.id)
-        c2 = models.User(name="Child2", username="child2", password_hash=get_password_hash("password"), role=models.RoleEnum.CHILD, parent_id=parent.id)
+        c1 = models.User(name="Selina", username="selina", password_hash=c1_hash, role=models.RoleEnum.CHILD, parent_id=parent.id)
+        c2 = models.User(name="Child2", username="child2", password_hash=c2_hash, role=models.RoleEnum.CHILD, parent_id=parent.id)
         db.add_all([c1, c2])
         db.commit()
         t1 = models.Task(parent_id=parent.id, name="Read Bible 10 minutes", category=models.CategoryEnum.FAITH, points=10)
@@ -1 +1 @@
-from . import badges, streaks, levels
+from . import badges, streaks, levels, ledger, stats
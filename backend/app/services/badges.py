@@ -1,33 +1,33 @@
-from sqlalchemy import func
+from types import MappingProxyType
 from app.models import models
-import datetime
+from app.db.session import SessionLocal
+from app.db.upsert import insert_ignore
+from app.services import ledger, stats as stats_service
 
-BADGES = [
-    {"code": "BIBLE_READER", "name": "Bible Reader", "description": "5 FAITH submissions on different days", "criteria": "BIBLE_READER"},
-    {"code": "HOMEWORK_HERO", "name": "Homework Hero", "description": "10 approved SCHOOL submissions", "criteria": "HOMEWORK_HERO"},
-    {"code": "KIND_HEART", "name": "Kind Heart", "description": "10 approved KINDNESS submissions", "criteria": "KIND_HEART"},
-    {"code": "LEVEL_2", "name": "Level 2 Reached", "description": "Reached 200 Points", "criteria": "POINTS_200"},
-    {"code": "LEVEL_3", "name": "Level 3 Reached", "description": "Reached 400 Points", "criteria": "POINTS_400"},
-    {"code": "LEVEL_4", "name": "Level 4 Reached", "description": "Reached 700 Points", "criteria": "POINTS_700"},
-    {"code": "LEVEL_5", "name": "Level 5 Reached", "description": "Reached 1000 Points", "criteria": "POINTS_1000"},
-]
+# code -> badge id, from committed badges rows (see load_catalog); replaced wholesale, never mutated
+_catalog = MappingProxyType({})
 
 
-def ensure_badges_exist(db):
-    for b in BADGES:
-        ex = db.query(models.Badge).filter(models.Badge.code==b["code"]).first()
-        if not ex:
-            nb = models.Badge(code=b["code"], name=b["name"], description=b["description"], criteria_type=b["criteria"], is_active=True)
-            db.add(nb)
-    db.commit()
+def load_catalog() -> MappingProxyType:
+    """Reload the catalog on a session of its own, so it only ever holds committed rows.
+
+    The baseline migration seeds the badges table and new badges ship in their own revision, so
+    nothing here writes. Runs at startup.
+    """
+    global _catalog
+    with SessionLocal() as db:
+        _catalog = MappingProxyType(dict(db.query(models.Badge.code, models.Badge.id).all()))
+    return _catalog
+
+
+def badge_ids() -> MappingProxyType:
+    # Processes that skipped startup (scripts, shells) load the catalog on first use
+    return _catalog or load_catalog()
 
 
 def check_and_award_badges(db, child_id: int):
-    ensure_badges_exist(db)
-    
     # Calculate Total Points (Lifetime XP, ignoring spendings)
-    ledger = db.query(models.PointsLedger).filter(models.PointsLedger.child_id == child_id).all()
-    total_points = sum(l.delta_points for l in ledger if l.delta_points > 0)
+    total_points = ledger.get_balance(db, child_id).lifetime_xp
     
     # Check Level Badges
     if total_points >= 200:
@@ -39,26 +39,18 @@ def check_and_award_badges(db, child_id: int):
     if total_points >= 1000:
         _award_if_missing(db, child_id, "LEVEL_5")
 
-    # Check Submission Badges
-    faith_subs = db.query(models.Submission).join(models.Task, models.Submission.task_id==models.Task.id).filter(models.Submission.child_id==child_id, models.Submission.status==models.SubmissionStatus.APPROVED, models.Task.category==models.CategoryEnum.FAITH).all()
-    faith_dates = set(s.created_at.date() for s in faith_subs)
-    if len(faith_dates) >= 5:
+    # Check Submission Badges (counters are kept by stats_service on approve)
+    stats = stats_service.get_stats(db, child_id)
+    if stats.faith_days >= 5:
         _award_if_missing(db, child_id, "BIBLE_READER")
-    school_count = db.query(models.Submission).join(models.Task, models.Submission.task_id==models.Task.id).filter(models.Submission.child_id==child_id, models.Submission.status==models.SubmissionStatus.APPROVED, models.Task.category==models.CategoryEnum.SCHOOL).count()
-    if school_count >= 10:
+    if stats.school_approved >= 10:
         _award_if_missing(db, child_id, "HOMEWORK_HERO")
-    kind_count = db.query(models.Submission).join(models.Task, models.Submission.task_id==models.Task.id).filter(models.Submission.child_id==child_id, models.Submission.status==models.SubmissionStatus.APPROVED, models.Task.category==models.CategoryEnum.KINDNESS).count()
-    if kind_count >= 10:
+    if stats.kindness_approved >= 10:
         _award_if_missing(db, child_id, "KIND_HEART")
 
 
 def _award_if_missing(db, child_id: int, badge_code: str):
-    badge = db.query(models.Badge).filter(models.Badge.code==badge_code).first()
-    if not badge:
-        return
-    exists = db.query(models.ChildBadge).filter(models.ChildBadge.child_id==child_id, models.ChildBadge.badge_id==badge.id).first()
-    if exists:
+    badge_id = badge_ids().get(badge_code)
+    if not badge_id:
         return
-    cb = models.ChildBadge(child_id=child_id, badge_id=badge.id)
-    db.add(cb)
-    db.commit()
+    insert_ignore(db, models.ChildBadge, child_id=child_id, badge_id=badge_id)
@@ -0,0 +1,78 @@
+"""Per-family version stamp for conditional GETs (see app.core.etag).
+
+Any session that writes during a request by a family member bumps that family's row in
+family_versions in its own transaction, just before commit, so the new version becomes visible
+together with the data. get_current_user records the family in `current_family`; writes made
+outside a request (seeding, scripts) don't bump anything, and neither do projection backfills
+(see backfill()).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.db.upsert import dialect_insert
+from app.models import models
+
+current_family = ContextVar("current_family", default=None)
+
+
+def family_of(principal) -> Optional[int]:
+    return principal.id if principal.role == models.RoleEnum.PARENT else principal.parent_id
+
+
+def get_version(db: Session, family_id: int) -> int:
+    version = db.execute(
+        select(models.FamilyVersion.version).where(models.FamilyVersion.parent_id == family_id)
+    ).scalar()
+    return version or 0
+
+
+def bump(db: Session, family_id: int):
+    stmt = dialect_insert(db, models.FamilyVersion).values(parent_id=family_id, version=1)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[models.FamilyVersion.parent_id],
+        set_={"version": models.FamilyVersion.version + 1},
+    ))
+
+
+@contextmanager
+def backfill(session: Session):
+    """Statements run inside don't count as a family write.
+
+    Balance and stats rows backfilled on first read hold nothing the family couldn't already see,
+    and bumping for them would change the ETag of the GET that triggered the backfill. A flush
+    in between still counts.
+    """
+    session.info["backfill"] = True
+    try:
+        yield
+    finally:
+        session.info.pop("backfill", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["family_write"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(state):
+    # Bulk update()/delete() and Core inserts (insert_ignore, ledger projections) skip the flush
+    if (state.is_insert or state.is_update or state.is_delete) and not state.session.info.get("backfill"):
+        state.session.info["family_write"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    family_id = current_family.get()
+    # before_commit runs ahead of the final flush, so pending changes count as a write too
+    wrote = session.info.pop("family_write", False) or session.new or session.dirty or session.deleted
+    if family_id is not None and wrote:
+        bump(session, family_id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset(session):
+    session.info.pop("family_write", None)
@@ -0,0 +1,179 @@
+from collections import defaultdict
+from sqlalchemy import insert
+from app.models import models
+from app.db.upsert import insert_ignore
+from app.services import family_versions
+import datetime
+
+
+class InsufficientPoints(Exception):
+    pass
+
+
+def month_start(when: datetime.datetime = None) -> datetime.date:
+    when = when or datetime.datetime.utcnow()
+    return datetime.date(when.year, when.month, 1)
+
+
+def _bucket(delta_points: int, reason: str) -> str:
+    # Which child_monthly_points column a ledger row counts towards
+    if delta_points < 0:
+        return "spent"
+    if (reason or "").startswith("Refund"):
+        return "refunded"
+    return "earned"
+
+
+def _load_balance(db, child_id: int) -> models.ChildBalance:
+    # Children created before the projections existed get their balance and
+    # monthly rows backfilled from the ledger once. Two first uses can race:
+    # the loser's INSERT does nothing and it reads the winner's row.
+    bal = db.get(models.ChildBalance, child_id)
+    if bal is None:
+        rows = db.query(
+            models.PointsLedger.id,
+            models.PointsLedger.delta_points,
+            models.PointsLedger.reason,
+            models.PointsLedger.created_at,
+        ).filter(models.PointsLedger.child_id == child_id).all()
+        balance = {"child_id": child_id, "balance": 0, "lifetime_xp": 0, "last_ledger_id": None}
+        months = {}
+        for entry_id, delta, reason, created_at in rows:
+            balance["balance"] += delta
+            balance["lifetime_xp"] += max(delta, 0)
+            balance["last_ledger_id"] = max(balance["last_ledger_id"] or 0, entry_id)
+            month = month_start(created_at)
+            if month not in months:
+                months[month] = {"child_id": child_id, "month": month, "earned": 0, "spent": 0, "refunded": 0}
+            months[month][_bucket(delta, reason)] += abs(delta)
+        with family_versions.backfill(db):
+            if insert_ignore(db, models.ChildBalance, **balance) and months:
+                db.execute(insert(models.ChildMonthlyPoints).values(list(months.values())))
+        bal = db.get(models.ChildBalance, child_id)
+    return bal
+
+
+def get_balance(db, child_id: int) -> models.ChildBalance:
+    return _load_balance(db, child_id)
+
+
+def get_month(db, child_id: int, month: datetime.date = None) -> models.ChildMonthlyPoints:
+    """Rollup row for one month (current month by default); zeros if there was no activity."""
+    _load_balance(db, child_id)
+    month = month or month_start()
+    row = db.get(models.ChildMonthlyPoints, (child_id, month))
+    if row is None:
+        row = models.ChildMonthlyPoints(child_id=child_id, month=month, earned=0, spent=0, refunded=0)
+    return row
+
+
+def get_months(db, child_id: int, since: datetime.date = None) -> list:
+    """Monthly rollup rows for charting, oldest first. Months without activity are omitted."""
+    _load_balance(db, child_id)
+    q = db.query(models.ChildMonthlyPoints).filter(models.ChildMonthlyPoints.child_id == child_id)
+    if since:
+        q = q.filter(models.ChildMonthlyPoints.month >= month_start(since))
+    return q.order_by(models.ChildMonthlyPoints.month).all()
+
+
+def _bump_month(db, child_id: int, month: datetime.date, bucket: str, amount: int):
+    insert_ignore(db, models.ChildMonthlyPoints, child_id=child_id, month=month, earned=0, spent=0, refunded=0)
+    column = getattr(models.ChildMonthlyPoints, bucket)
+    db.query(models.ChildMonthlyPoints).filter(
+        models.ChildMonthlyPoints.child_id == child_id,
+        models.ChildMonthlyPoints.month == month,
+    ).update({column: column + amount}, synchronize_session="evaluate")
+
+
+def _record(db, child_id: int, delta_points: int, reason: str, related_submission_id: int = None, created_by_parent_id: int = None) -> models.PointsLedger:
+    entry = models.PointsLedger(
+        child_id=child_id,
+        delta_points=delta_points,
+        reason=reason,
+        related_submission_id=related_submission_id,
+        created_by_parent_id=created_by_parent_id,
+        created_at=datetime.datetime.utcnow(),
+    )
+    db.add(entry)
+    db.flush()
+    _bump_month(db, child_id, month_start(entry.created_at), _bucket(delta_points, reason), abs(delta_points))
+    return entry
+
+
+def _credit(db, bal: models.ChildBalance, delta_points: int, positive_points: int, last_ledger_id: int):
+    db.query(models.ChildBalance).filter(models.ChildBalance.child_id == bal.child_id).update({
+        models.ChildBalance.balance: models.ChildBalance.balance + delta_points,
+        models.ChildBalance.lifetime_xp: models.ChildBalance.lifetime_xp + positive_points,
+        models.ChildBalance.last_ledger_id: last_ledger_id,
+        models.ChildBalance.updated_at: datetime.datetime.utcnow(),
+    }, synchronize_session=False)
+    db.expire(bal)
+
+
+def add_entry(db, child_id: int, delta_points: int, reason: str, related_submission_id: int = None, created_by_parent_id: int = None) -> models.PointsLedger:
+    """Insert a ledger row and apply it to child_balances and child_monthly_points in the same transaction.
+
+    All PointsLedger writes must go through here (or add_entries/spend) so the projections stay in step.
+    """
+    bal = _load_balance(db, child_id)
+    entry = _record(db, child_id, delta_points, reason, related_submission_id, created_by_parent_id)
+    _credit(db, bal, delta_points, max(delta_points, 0), entry.id)
+    return entry
+
+
+def add_entries(db, entries: list) -> list:
+    """Bulk add_entry: one multi-row INSERT, then one balance update per child and one rollup update per month bucket.
+
+    Each entry is a dict of PointsLedger columns (child_id, delta_points, reason, ...). Returns the new ledger ids.
+    """
+    if not entries:
+        return []
+    now = datetime.datetime.utcnow()
+    rows = [dict(e, created_at=now) for e in entries]
+    balances = {child_id: _load_balance(db, child_id) for child_id in {r["child_id"] for r in rows}}
+    inserted = db.execute(
+        insert(models.PointsLedger).values(rows).returning(models.PointsLedger.id, models.PointsLedger.child_id)
+    ).all()
+
+    last_ids = defaultdict(int)
+    for entry_id, child_id in inserted:
+        last_ids[child_id] = max(last_ids[child_id], entry_id)
+    deltas = defaultdict(int)
+    positives = defaultdict(int)
+    buckets = defaultdict(int)
+    for r in rows:
+        deltas[r["child_id"]] += r["delta_points"]
+        positives[r["child_id"]] += max(r["delta_points"], 0)
+        buckets[(r["child_id"], _bucket(r["delta_points"], r["reason"]))] += abs(r["delta_points"])
+
+    for child_id, bal in balances.items():
+        _credit(db, bal, deltas[child_id], positives[child_id], last_ids[child_id])
+    for (child_id, bucket), amount in buckets.items():
+        _bump_month(db, child_id, month_start(now), bucket, amount)
+    return [entry_id for entry_id, _ in inserted]
+
+
+def spend(db, child_id: int, cost_points: int, reason: str, created_by_parent_id: int = None) -> models.PointsLedger:
+    """Deduct cost_points from the child's balance, raising InsufficientPoints if it does not cover them.
+
+    The balance check and the deduction are a single conditional UPDATE, so concurrent
+    spends for the same child queue on that child's child_balances row lock until commit
+    and can never take the balance below zero. Spends for different children don't contend.
+    """
+    bal = _load_balance(db, child_id)
+    updated = db.query(models.ChildBalance).filter(
+        models.ChildBalance.child_id == child_id,
+        models.ChildBalance.balance >= cost_points,
+    ).update({
+        models.ChildBalance.balance: models.ChildBalance.balance - cost_points,
+        models.ChildBalance.updated_at: datetime.datetime.utcnow(),
+    }, synchronize_session=False)
+    if not updated:
+        db.expire(bal)
+        raise InsufficientPoints()
+    entry = _record(db, child_id, -cost_points, reason, created_by_parent_id=created_by_parent_id)
+    db.query(models.ChildBalance).filter(models.ChildBalance.child_id == child_id).update(
+        {models.ChildBalance.last_ledger_id: entry.id}, synchronize_session=False
+    )
+    db.expire(bal)
+    return entry
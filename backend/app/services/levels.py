@@ -1,8 +1,7 @@
-from sqlalchemy import func
-from app.models import models
+from app.services import ledger
 
 def compute_level(db, child_id: int) -> int:
-    total = db.query(func.coalesce(func.sum(models.PointsLedger.delta_points), 0)).filter(models.PointsLedger.child_id==child_id).scalar() or 0
+    total = ledger.get_balance(db, child_id).balance
     if total < 200:
         return 1
     if total < 400:
@@ -0,0 +1,60 @@
+from collections import Counter
+from sqlalchemy import func, insert
+from app.models import models
+from app.db.upsert import insert_ignore
+from app.services import family_versions
+import datetime
+
+
+def _column(category: models.CategoryEnum) -> str:
+    return f"{models.CategoryEnum(category).value.lower()}_approved"
+
+
+def _load_stats(db, child_id: int) -> models.ChildStats:
+    # Children approved before child_stats existed get their row backfilled once.
+    # Callers must load the stats before an approval's status change is flushed, or it is counted twice.
+    # Two first uses can race: the loser's INSERT does nothing and it reads the winner's row.
+    stats = db.get(models.ChildStats, child_id)
+    if stats is None:
+        approved = (
+            db.query(models.Submission)
+            .join(models.Task, models.Submission.task_id == models.Task.id)
+            .filter(models.Submission.child_id == child_id, models.Submission.status == models.SubmissionStatus.APPROVED)
+        )
+        values = {"child_id": child_id, "faith_approved": 0, "school_approved": 0, "home_approved": 0, "kindness_approved": 0, "other_approved": 0}
+        counts = approved.with_entities(models.Task.category, func.count(models.Submission.id)).group_by(models.Task.category).all()
+        for category, count in counts:
+            values[_column(category)] = count
+        faith_dates = approved.with_entities(models.Submission.created_at).filter(models.Task.category == models.CategoryEnum.FAITH).all()
+        days = {created_at.date() for (created_at,) in faith_dates}
+        values["faith_days"] = len(days)
+        with family_versions.backfill(db):
+            if insert_ignore(db, models.ChildStats, **values) and days:
+                db.execute(insert(models.ChildFaithDay).values([{"child_id": child_id, "day": d} for d in days]))
+        stats = db.get(models.ChildStats, child_id)
+    return stats
+
+
+def get_stats(db, child_id: int) -> models.ChildStats:
+    return _load_stats(db, child_id)
+
+
+def record_approvals(db, child_id: int, approvals: list):
+    """Bump counters for newly approved submissions, given as (category, submission created_at) pairs."""
+    stats = _load_stats(db, child_id)
+    counts = Counter(_column(category) for category, _ in approvals)
+    new_days = 0
+    for day in {created_at.date() for category, created_at in approvals if category == models.CategoryEnum.FAITH}:
+        if insert_ignore(db, models.ChildFaithDay, child_id=child_id, day=day):
+            new_days += 1
+
+    values = {getattr(models.ChildStats, col): getattr(models.ChildStats, col) + n for col, n in counts.items()}
+    if new_days:
+        values[models.ChildStats.faith_days] = models.ChildStats.faith_days + new_days
+    values[models.ChildStats.updated_at] = datetime.datetime.utcnow()
+    db.query(models.ChildStats).filter(models.ChildStats.child_id == child_id).update(values, synchronize_session=False)
+    db.expire(stats)
+
+
+def record_approval(db, child_id: int, category: models.CategoryEnum, submitted_at: datetime.datetime):
+    record_approvals(db, child_id, [(category, submitted_at)])
@@ -20,14 +20,24 @@ print(f"Connecting to database...")
 engine = create_engine(DATABASE_URL)
 
 TABLES_IN_ORDER = [
+    "child_balances",
+    "child_monthly_points",
+    "child_stats",
+    "child_faith_days",
     "child_badges",
     "reward_redemptions",
     "points_ledger",
+    "submission_evidence",
     "submissions",
     "tasks",
     "parent_settings",
     "rewards",
     "badges",
+    "family_versions",
+    "idempotency_keys",
+    "announcement_reads",
+    "announcement_dismissals",
+    "announcements",
     "users",
 ]
 
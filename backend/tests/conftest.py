@@ -0,0 +1,88 @@
+"""Shared fixtures. The whole run uses one SQLite file, built with `alembic upgrade head`.
+
+DATABASE_URL has to be set before anything imports app.core.config, so it's set here at import
+time, ahead of the test modules.
+"""
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="familypoints-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["METRICS_TOKEN"] = "test"
+os.environ["DB_WARM_ON_STARTUP"] = "false"
+# 40 connections per engine, so test_async_throughput compares engines rather than pool sizes
+os.environ["DB_POOL_SIZE"] = "80"
+os.environ["DB_MAX_OVERFLOW"] = "0"
+os.environ["DB_ASYNC_POOL_SHARE"] = "0.5"
+
+_names = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND, env=os.environ, check=True, capture_output=True,
+    )
+    return DB_PATH
+
+
+@pytest.fixture(scope="session")
+def client(migrated_db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(migrated_db):
+    from app.db.session import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def ok(response):
+    """The JSON body of a 2xx response; fails the test with the body otherwise."""
+    assert response.status_code < 300, (response.status_code, response.text)
+    return response.json()
+
+
+def _login(client, username):
+    token = ok(client.post("/api/v1/auth/login", data={"username": username, "password": "pw"}))["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+class Family:
+    """A parent and their children, registered through the API, with auth headers for each."""
+
+    def __init__(self, client, children=1):
+        n = next(_names)
+        email = f"parent{n}@example.com"
+        self.parent = ok(client.post("/api/v1/auth/register-parent", json={"name": f"P{n}", "email": email, "password": "pw", "role": "PARENT"}))
+        self.parent_headers = _login(client, email)
+        self.children, self.child_headers = [], []
+        for i in range(children):
+            username = f"kid{n}_{i}"
+            self.children.append(ok(client.post(
+                "/api/v1/children", json={"name": f"C{n}_{i}", "username": username, "password": "pw"}, headers=self.parent_headers,
+            )))
+            self.child_headers.append(_login(client, username))
+
+
+@pytest.fixture
+def family(client):
+    return Family(client)
+
+
+@pytest.fixture
+def make_family(client):
+    return lambda children=1: Family(client, children)
@@ -0,0 +1,20 @@
+def test_parent_deletes_read_and_dismissed_announcement(client, make_family):
+    family = make_family(children=2)
+    parent, (kid, other_kid) = family.parent_headers, family.child_headers
+    ann = client.post("/api/v1/announcements", json={"message": "Dinner at six"}, headers=parent).json()
+    assert client.post(f"/api/v1/announcements/{ann['id']}/read", headers=kid).status_code == 200
+    assert client.post(f"/api/v1/announcements/{ann['id']}/read", headers=other_kid).status_code == 200
+    assert client.delete(f"/api/v1/announcements/{ann['id']}", headers=kid).json() == {"status": "dismissed"}
+
+    response = client.delete(f"/api/v1/announcements/{ann['id']}", headers=parent)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"status": "deleted"}
+    assert client.get("/api/v1/announcements", headers=parent).json()["items"] == []
+    assert client.get("/api/v1/announcements", headers=other_kid).json()["items"] == []
+
+
+def test_child_cannot_delete_for_the_family(client, family):
+    ann = client.post("/api/v1/announcements", json={"message": "Hi"}, headers=family.parent_headers).json()
+    # Unread: a child can't even dismiss it
+    assert client.delete(f"/api/v1/announcements/{ann['id']}", headers=family.child_headers[0]).status_code == 403
+    assert len(client.get("/api/v1/announcements", headers=family.parent_headers).json()["items"]) == 1
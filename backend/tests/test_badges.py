@@ -0,0 +1,29 @@
+"""The badge catalog holds committed rows only, and awarding a badge never writes the catalog."""
+from sqlalchemy import func, select
+from app.db.session import SessionLocal
+from app.models import models
+from app.services import badges, ledger
+
+
+def test_catalog_ignores_uncommitted_rows(migrated_db, monkeypatch):
+    monkeypatch.setattr(badges, "_catalog", badges.MappingProxyType({}))
+    with SessionLocal() as db:
+        db.add(models.Badge(code="UNCOMMITTED", name="n", description="d", criteria_type="c", is_active=True))
+        db.flush()
+        catalog = badges.badge_ids()
+        db.rollback()
+    assert "LEVEL_2" in catalog and "UNCOMMITTED" not in catalog
+
+
+def test_awarding_reads_the_catalog_without_writing_it(family, db, monkeypatch):
+    child_id = family.children[0]["id"]
+    monkeypatch.setattr(badges, "_catalog", badges.MappingProxyType({}))
+    count = db.scalar(select(func.count()).select_from(models.Badge))
+
+    ledger.add_entry(db, child_id, 250, "TASK_APPROVED")
+    badges.check_and_award_badges(db, child_id)
+    db.commit()
+
+    awarded = db.scalars(select(models.Badge.code).join(models.ChildBadge).where(models.ChildBadge.child_id == child_id)).all()
+    assert awarded == ["LEVEL_2"]
+    assert db.scalar(select(func.count()).select_from(models.Badge)) == count
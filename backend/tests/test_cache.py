@@ -0,0 +1,170 @@
+"""The cache backends. MemoryCache: byte budget, LRU order, TTLs and compare-and-set, on a fake
+clock. RedisCache against fakeredis: compare-and-set both ways (including the Lua script), TTLs,
+and an outage read as misses and logged once."""
+import asyncio
+import logging
+import fakeredis
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import MemoryCache, RedisCache
+
+# Key and value sizes below count this per entry as well
+OVERHEAD = cache_module._ENTRY_OVERHEAD
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def _entry(key: str, value: bytes) -> int:
+    return len(key) + len(value) + OVERHEAD
+
+
+def test_memory_cache_stays_within_its_byte_budget():
+    value = b"x" * 100
+    memory = MemoryCache(max_bytes=_entry("k00", value) * 10)
+    for i in range(25):
+        run(memory.set(f"k{i:02}", value))
+    stats = memory.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert (stats["size"], stats["evictions"]) == (10, 15)
+    assert stats["bytes"] == 10 * _entry("k00", value)
+
+
+def test_memory_cache_evicts_least_recently_used_first():
+    memory = MemoryCache(max_bytes=_entry("a", b"v") * 10)
+    for key in "abcdefghij":
+        run(memory.set(key, b"v"))
+    # Reads and rewrites both count as use
+    run(memory.get("a"))
+    run(memory.mget(["b"]))
+    run(memory.set("c", b"v"))
+    run(memory.set("k", b"v"))
+    run(memory.set("l", b"v"))
+    assert run(memory.mget(list("abcdefghijkl"))) == [b"v"] * 3 + [None] * 2 + [b"v"] * 7
+
+
+def test_memory_cache_skips_entries_too_big_to_share():
+    memory = MemoryCache(max_bytes=10_000)
+    run(memory.set("small", b"v"))
+    run(memory.set("big", b"x" * 1000))
+    assert run(memory.mget(["small", "big"])) == [b"v", None]
+    # Replacing a small entry with a big one drops the old value rather than keeping it stale
+    run(memory.set("small", b"x" * 1000))
+    assert run(memory.get("small")) is None
+    assert memory.stats()["bytes"] == 0
+
+
+def test_memory_cache_expires_entries(clock):
+    memory = MemoryCache(max_bytes=10_000, default_ttl=60)
+    run(memory.set("default", b"v"))
+    run(memory.set("short", b"v", ttl=5))
+    clock.now += 5.5
+    assert run(memory.mget(["default", "short"])) == [b"v", None]
+    clock.now += 60
+    assert run(memory.get("default")) is None
+    stats = memory.stats()
+    assert (stats["size"], stats["bytes"]) == (0, 0)
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_memory_cache_without_a_ttl_keeps_entries(clock):
+    memory = MemoryCache(max_bytes=10_000)
+    run(memory.set("k", b"v"))
+    clock.now += 10 ** 6
+    assert run(memory.get("k")) == b"v"
+
+
+def test_memory_compare_and_set(clock):
+    memory = MemoryCache(max_bytes=10_000)
+    assert run(memory.compare_and_set("k", None, b"v1"))
+    assert not run(memory.compare_and_set("k", None, b"other"))
+    assert run(memory.compare_and_set("k", b"v1", b"v2", ttl=5))
+    assert not run(memory.compare_and_set("k", b"v1", b"v3"))
+    assert not run(memory.compare_and_set("missing", b"v1", b"v2"))
+    assert run(memory.get("k")) == b"v2"
+    # An expired entry counts as missing
+    clock.now += 6
+    assert not run(memory.compare_and_set("k", b"v2", b"v3"))
+    assert run(memory.compare_and_set("k", None, b"v3"))
+    assert run(memory.get("k")) == b"v3"
+    assert memory.stats()["cas_conflicts"] == 4
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def cache(server):
+    return RedisCache(fakeredis.FakeAsyncRedis(server=server), prefix="test:")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_compare_and_set_when_missing(cache):
+    assert run(cache.compare_and_set("k", None, b"first"))
+    assert not run(cache.compare_and_set("k", None, b"second"))
+    assert run(cache.get("k")) == b"first"
+    assert cache.stats()["cas_conflicts"] == 1
+
+
+def test_compare_and_set_against_a_value(cache):
+    run(cache.set("k", b"v1"))
+    assert run(cache.compare_and_set("k", b"v1", b"v2"))
+    assert not run(cache.compare_and_set("k", b"v1", b"v3"))
+    assert run(cache.get("k")) == b"v2"
+    # A value can't match a missing key
+    assert not run(cache.compare_and_set("gone", b"v1", b"v2"))
+    assert run(cache.get("gone")) is None
+    assert cache.stats()["cas_conflicts"] == 2
+
+
+def test_keys_are_prefixed_and_ttls_applied(cache, server):
+    raw = fakeredis.FakeRedis(server=server)
+    run(cache.set("plain", b"v"))
+    run(cache.set("short", b"v", ttl=30))
+    run(cache.compare_and_set("short", b"v", b"w", ttl=60))
+    assert raw.get("test:plain") == b"v"
+    assert raw.pttl("test:plain") == -1
+    assert 0 < raw.pttl("test:short") <= 60_000
+    assert run(cache.mget(["plain", "short", "missing"])) == [b"v", b"w", None]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_errors_read_as_misses_and_log_once(cache, server, caplog):
+    run(cache.set("k", b"v"))
+    server.connected = False
+    with caplog.at_level(logging.DEBUG, logger="app.core.cache"):
+        assert run(cache.get("k")) is None
+        assert run(cache.mget(["k", "other"])) == [None, None]
+        assert not run(cache.compare_and_set("k", None, b"w"))
+        assert not run(cache.compare_and_set("k", b"v", b"w"))
+        run(cache.set("k", b"w"))
+        run(cache.delete("k"))
+        server.connected = True
+        assert run(cache.get("k")) == b"v"
+
+    stats = cache.stats()
+    assert stats["errors"] == 6
+    assert stats["cas_conflicts"] == 0  # an outage isn't a conflict
+    assert stats["misses"] == 3
+    levels = [r.levelno for r in caplog.records]
+    assert levels.count(logging.WARNING) == 1
+    assert levels.count(logging.DEBUG) == 5
+    assert levels[-1] == logging.INFO
@@ -0,0 +1,77 @@
+"""The Core read path (app.db.rows) against the ORM path it replaced, on a 10k-row list.
+
+Both must produce the same JSON; Core must be clearly faster and lighter. Run with -s to see the
+numbers.
+"""
+import datetime
+import json
+import time
+import tracemalloc
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from app.db import rows
+from app.db.session import SessionLocal
+from app.models import models
+from app.schemas.schemas import RewardOut
+
+ROWS = 10_000
+
+
+@pytest.fixture
+def parent_with_rewards(family, db):
+    parent_id = family.parent["id"]
+    now = datetime.datetime.utcnow()
+    db.execute(insert(models.Reward), [
+        {"parent_id": parent_id, "name": f"reward {i}", "type": models.RewardType.GIFT, "cost_points": i,
+         "description": "d" * 40, "is_active": True, "created_at": now + datetime.timedelta(microseconds=i)}
+        for i in range(ROWS)
+    ])
+    db.commit()
+    return parent_id
+
+
+def _orm(parent_id) -> bytes:
+    with SessionLocal() as db:
+        objs = db.execute(select(models.Reward).where(models.Reward.parent_id == parent_id).order_by(models.Reward.id)).scalars().all()
+        return json.dumps(jsonable_encoder([RewardOut.from_orm(o) for o in objs])).encode()
+
+
+def _core(parent_id) -> bytes:
+    with SessionLocal() as db:
+        query = select(*rows.columns(models.Reward, RewardOut)).where(models.Reward.parent_id == parent_id).order_by(models.Reward.id)
+        return rows.RowsResponse(db.execute(query).mappings().all()).body
+
+
+def _measure(read, parent_id):
+    read(parent_id)  # warm up
+    best = min(_timed(read, parent_id) for _ in range(3))
+    tracemalloc.start()
+    try:
+        read(parent_id)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _timed(read, parent_id) -> float:
+    started = time.perf_counter()
+    read(parent_id)
+    return time.perf_counter() - started
+
+
+def test_core_rows_match_orm_output(parent_with_rewards):
+    core = json.loads(_core(parent_with_rewards))
+    assert len(core) == ROWS
+    assert core == json.loads(_orm(parent_with_rewards))
+
+
+@pytest.mark.benchmark
+def test_core_rows_are_faster_and_lighter_than_orm(parent_with_rewards):
+    orm_time, orm_peak = _measure(_orm, parent_with_rewards)
+    core_time, core_peak = _measure(_core, parent_with_rewards)
+    print(f"\n{ROWS} rows: ORM {orm_time * 1000:.0f}ms, peak {orm_peak / 1e6:.1f}MB; "
+          f"Core {core_time * 1000:.0f}ms, peak {core_peak / 1e6:.1f}MB")
+    assert core_time < orm_time / 2
+    assert core_peak < orm_peak
@@ -0,0 +1,56 @@
+import datetime
+from sqlalchemy import delete
+from app.models import models
+from app.services import family_versions, ledger
+
+
+def test_unchanged_list_revalidates_with_304(client, family):
+    first = client.get("/api/v1/tasks", headers=family.parent_headers)
+    etag = first.headers["etag"]
+    again = client.get("/api/v1/tasks", headers={**family.parent_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+
+    client.post("/api/v1/tasks", json={"name": "t", "category": "HOME", "points": 5}, headers=family.parent_headers)
+    changed = client.get("/api/v1/tasks", headers={**family.parent_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_child_summary_changes_with_the_month(client, family, db, monkeypatch):
+    child_id = family.children[0]["id"]
+    ledger.add_entry(db, child_id, 250, "TASK_APPROVED")
+    db.commit()
+    url = f"/api/v1/children/{child_id}/summary"
+
+    first = client.get(url, headers=family.parent_headers)
+    assert first.json()["points"]["thisMonthMoneyEquivalent"] == 2.5
+    etag = first.headers["etag"]
+    assert client.get(url, headers={**family.parent_headers, "If-None-Match": etag}).status_code == 304
+
+    # Next month, with no writes in between: neither a 304 nor the cached body
+    next_month = ledger.month_start() + datetime.timedelta(days=31)
+    monkeypatch.setattr(ledger, "month_start", lambda when=None: next_month.replace(day=1) if when is None else datetime.date(when.year, when.month, 1))
+    rolled = client.get(url, headers={**family.parent_headers, "If-None-Match": etag})
+    assert rolled.status_code == 200
+    assert rolled.headers["etag"] != etag
+    assert rolled.json()["points"]["thisMonthMoneyEquivalent"] == 0
+    assert rolled.json()["points"]["totalPoints"] == 250
+
+
+def test_first_read_backfill_keeps_the_etag(client, family, db):
+    # A child from before the projections: ledger rows, but no balance, monthly or stats rows yet
+    child_id = family.children[0]["id"]
+    db.add(models.PointsLedger(child_id=child_id, delta_points=40, reason="TASK_APPROVED"))
+    db.commit()
+    for model in (models.ChildBalance, models.ChildMonthlyPoints, models.ChildStats):
+        db.execute(delete(model).where(model.child_id == child_id))
+    db.commit()
+    version = family_versions.get_version(db, family.parent["id"])
+
+    url = f"/api/v1/children/{child_id}/summary"
+    first = client.get(url, headers=family.parent_headers)
+    assert first.json()["points"]["totalPoints"] == 40
+    again = client.get(url, headers={**family.parent_headers, "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert db.get(models.ChildBalance, child_id).balance == 40
+    assert family_versions.get_version(db, family.parent["id"]) == version
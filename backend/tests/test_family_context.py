@@ -0,0 +1,39 @@
+"""The cached family context is dropped, and reloaded with the change, when a child is added or
+removed and when the parent updates their settings."""
+from app.core.family import family_cache
+from conftest import ok
+
+
+def _context(client, family):
+    # GET /settings goes through get_family_context, which loads the context into the cache
+    ok(client.get("/api/v1/settings/", headers=family.parent_headers))
+    context = family_cache.get(family.parent["id"])
+    assert context is not None
+    return context
+
+
+def test_adding_and_removing_a_child_refreshes_the_roster(client, family):
+    parent_id = family.parent["id"]
+    assert set(_context(client, family).children) == {family.children[0]["id"]}
+
+    child = ok(client.post(
+        "/api/v1/children", json={"name": "Added", "username": f"added{parent_id}", "password": "pw"},
+        headers=family.parent_headers,
+    ))
+    assert family_cache.get(parent_id) is None
+    assert _context(client, family).children == {family.children[0]["id"]: family.children[0]["name"], child["id"]: "Added"}
+
+    ok(client.delete(f"/api/v1/children/{child['id']}", headers=family.parent_headers))
+    assert family_cache.get(parent_id) is None
+    assert set(_context(client, family).children) == {family.children[0]["id"]}
+
+
+def test_updating_settings_refreshes_the_context(client, family):
+    before = _context(client, family)
+    ok(client.put("/api/v1/settings/", json={"points_per_dollar": before.points_per_dollar + 7}, headers=family.parent_headers))
+    assert family_cache.get(family.parent["id"]) is None
+
+    after = _context(client, family)
+    assert after.points_per_dollar == before.points_per_dollar + 7
+    # And what the family sees comes from the reloaded context
+    assert ok(client.get("/api/v1/settings/", headers=family.child_headers[0]))["points_per_dollar"] == after.points_per_dollar
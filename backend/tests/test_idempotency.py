@@ -0,0 +1,73 @@
+"""Idempotency-Key on POST /api/v1/rewards/{id}/redeem: a replay gets the first response back and
+moves no points; a failed request leaves its key free for the retry."""
+import pytest
+from sqlalchemy import func, select
+from conftest import ok
+from app.models import models
+from app.services import ledger
+
+
+@pytest.fixture
+def reward(client, family):
+    return ok(client.post("/api/v1/rewards/", json={"name": "Toy", "type": "GIFT", "cost_points": 300}, headers=family.parent_headers))
+
+
+def _redeem(client, family, reward, key=None):
+    headers = dict(family.child_headers[0])
+    if key is not None:
+        headers["Idempotency-Key"] = key
+    return client.post(f"/api/v1/rewards/{reward['id']}/redeem", headers=headers)
+
+
+def _spends(db, child_id):
+    return db.scalar(select(func.count()).select_from(models.PointsLedger)
+                     .where(models.PointsLedger.child_id == child_id, models.PointsLedger.delta_points < 0))
+
+
+def test_replay_returns_the_first_response(client, family, db, reward):
+    child_id = family.children[0]["id"]
+    ledger.add_entry(db, child_id, 1000, "TASK_APPROVED")
+    db.commit()
+
+    first = _redeem(client, family, reward, key="redeem-1")
+    replay = _redeem(client, family, reward, key="redeem-1")
+    assert first.status_code == replay.status_code == 200
+    assert replay.content == first.content
+    assert replay.headers["content-type"] == first.headers["content-type"]
+
+    db.expire_all()
+    assert _spends(db, child_id) == 1
+    assert ledger.get_balance(db, child_id).balance == 700
+    # A new key is a new redemption
+    assert ok(_redeem(client, family, reward, key="redeem-2"))["id"] != first.json()["id"]
+    db.expire_all()
+    assert _spends(db, child_id) == 2
+
+
+def test_failed_request_leaves_the_key_free(client, family, db, reward):
+    child_id = family.children[0]["id"]
+    assert _redeem(client, family, reward, key="retry").status_code == 400  # no points yet
+
+    ledger.add_entry(db, child_id, 300, "TASK_APPROVED")
+    db.commit()
+    ok(_redeem(client, family, reward, key="retry"))
+    db.expire_all()
+    assert _spends(db, child_id) == 1
+
+
+def test_key_reused_on_another_request(client, family, db, reward):
+    ledger.add_entry(db, family.children[0]["id"], 1000, "TASK_APPROVED")
+    db.commit()
+    ok(_redeem(client, family, reward, key="once"))
+    other = ok(client.post("/api/v1/rewards/", json={"name": "Book", "type": "GIFT", "cost_points": 100}, headers=family.parent_headers))
+    assert _redeem(client, family, other, key="once").status_code == 422
+
+
+def test_without_a_key_every_request_runs(client, family, db, reward):
+    child_id = family.children[0]["id"]
+    ledger.add_entry(db, child_id, 1000, "TASK_APPROVED")
+    db.commit()
+    ok(_redeem(client, family, reward))
+    ok(_redeem(client, family, reward))
+    db.expire_all()
+    assert _spends(db, child_id) == 2
@@ -0,0 +1,148 @@
+"""The invalidation bus: messages published on a session go out only when it commits, a rollback
+drops them, and the listener thread hands NOTIFY payloads to the local subscribers.
+
+There is no Postgres here, so the listener runs against a stand-in connection: a socket for
+select() plus the psycopg2 poll()/notifies interface.
+"""
+import asyncio
+import logging
+import socket
+import threading
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import text
+from app.core import invalidation
+from app.db.session import AsyncSessionLocal, SessionLocal
+
+
+@pytest.fixture
+def received(monkeypatch):
+    calls = []
+    monkeypatch.setitem(invalidation._subscribers, "test", [lambda family_id, key: calls.append((family_id, key))])
+    return calls
+
+
+def test_publish_waits_for_commit(migrated_db, received):
+    with SessionLocal() as db:
+        invalidation.publish(db, 7, "test", "a")
+        invalidation.publish(db, 7, "test", "a")  # the same message twice goes out once
+        invalidation.publish(db, 7, "test")
+        db.flush()
+        assert received == []
+        db.commit()
+    assert len(received) == 2 and set(received) == {(7, None), (7, "a")}
+
+
+def test_rollback_discards_pending_messages(migrated_db, received):
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+        invalidation.publish(db, 7, "test", "a")
+        db.rollback()
+        # Before the session has touched the database too
+        invalidation.publish(db, 7, "test", "b")
+        db.rollback()
+        invalidation.publish(db, 7, "test", "c")
+        db.commit()
+    assert received == [(7, "c")]
+
+
+def test_closing_without_commit_discards_pending_messages(migrated_db, received):
+    db = SessionLocal()
+    invalidation.publish(db, 7, "test", "a")
+    db.close()
+    db.commit()
+    assert received == []
+
+
+def test_savepoint_rollback_keeps_the_outer_messages(migrated_db, received):
+    with SessionLocal() as db:
+        invalidation.publish(db, 7, "test", "outer")
+        with db.begin_nested() as savepoint:
+            savepoint.rollback()
+        db.commit()
+    assert received == [(7, "outer")]
+
+
+def test_async_sessions_publish_on_commit(migrated_db, received):
+    async def write(commit: bool):
+        async with AsyncSessionLocal() as db:
+            invalidation.publish(db, 7, "test", "async")
+            await db.flush()
+            assert received == []
+            await (db.commit() if commit else db.rollback())
+
+    asyncio.run(write(commit=False))
+    assert received == []
+    asyncio.run(write(commit=True))
+    assert received == [(7, "async")]
+
+
+def test_dispatch_parses_and_isolates_subscribers(monkeypatch, received, caplog):
+    def broken(family_id, key):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(invalidation._subscribers, "test", [broken, *invalidation._subscribers["test"]])
+    with caplog.at_level(logging.WARNING, logger="app.core.invalidation"):
+        invalidation.dispatch("12:test:with:colons")
+        invalidation.dispatch("not-a-family:test")
+    # A failing subscriber doesn't stop the others; a malformed payload is logged and skipped
+    assert received == [(12, "with:colons")]
+    assert [r.levelno for r in caplog.records] == [logging.ERROR, logging.WARNING]
+
+
+class FakeConnection:
+    """What the listener uses of a psycopg2 connection in LISTEN mode."""
+
+    def __init__(self):
+        self._ours, self._theirs = socket.socketpair()
+        self.notifies = []
+
+    def notify(self, payload: str):
+        self._theirs.sendall(payload.encode() + b"\n")
+
+    def drop(self):
+        self._theirs.close()
+
+    def fileno(self):
+        return self._ours.fileno()
+
+    def poll(self):
+        data = self._ours.recv(4096)
+        if not data:
+            raise ConnectionError("server closed the connection")
+        self.notifies.extend(SimpleNamespace(payload=p) for p in data.decode().splitlines())
+
+    def close(self):
+        self._ours.close()
+
+
+def _wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("timed out")
+
+
+def test_listener_dispatches_notifications_locally(monkeypatch, received):
+    conn = FakeConnection()
+    connects = []
+    monkeypatch.setattr(invalidation._Listener, "_connect", lambda self: connects.append(1) or conn)
+    # No request traffic, so after a drop the listener stays disconnected
+    monkeypatch.setattr(invalidation._Listener, "_traffic_since", lambda self, since: False)
+    listener = invalidation._Listener()
+    listener.start()
+    try:
+        conn.notify("3:test:k1")
+        conn.notify("4:test")
+        _wait_for(lambda: len(received) == 2)
+        assert received == [(3, "k1"), (4, None)]
+
+        # A lost connection flushes everything, since messages may have been missed
+        conn.drop()
+        _wait_for(lambda: (None, None) in received)
+        assert len(connects) == 1
+    finally:
+        listener.stop()
+        listener.join(timeout=5)
+    assert not listener.is_alive()
@@ -0,0 +1,129 @@
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import insert
+from app.db.session import SessionLocal
+from app.models import models
+from app.services import ledger, stats
+
+
+def _seed_points(db, child_id, points):
+    # Written straight to the ledger, like rows from before child_balances existed
+    db.execute(insert(models.PointsLedger).values(
+        child_id=child_id, delta_points=points, reason="TASK_APPROVED", created_at=datetime.datetime.utcnow(),
+    ))
+    db.commit()
+
+
+def test_concurrent_spends_never_overdraw(family, db):
+    child_id = family.children[0]["id"]
+    ledger.add_entry(db, child_id, 1000, "TASK_APPROVED")
+    db.commit()
+
+    results = []
+    start = threading.Barrier(20)
+
+    def spend():
+        session = SessionLocal()
+        try:
+            start.wait()
+            ledger.spend(session, child_id, 300, "Reward Redemption: test")
+            session.commit()
+            results.append("ok")
+        except ledger.InsufficientPoints:
+            session.rollback()
+            results.append("insufficient")
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(20) as pool:
+        for future in [pool.submit(spend) for _ in range(20)]:
+            future.result()
+
+    assert results.count("ok") == 3
+    assert results.count("insufficient") == 17
+    db.expire_all()
+    assert ledger.get_balance(db, child_id).balance == 100
+    assert ledger.get_month(db, child_id).spent == 900
+
+
+def test_concurrent_first_redeems_backfill_once(client, family, db):
+    child_id = family.children[0]["id"]
+    _seed_points(db, child_id, 1000)
+    assert db.get(models.ChildBalance, child_id) is None
+    reward = client.post(
+        "/api/v1/rewards/", json={"name": "Toy", "type": "GIFT", "cost_points": 300}, headers=family.parent_headers,
+    ).json()
+
+    start = threading.Barrier(10)
+
+    def redeem():
+        start.wait()
+        return client.post(f"/api/v1/rewards/{reward['id']}/redeem", headers=family.child_headers[0]).status_code
+
+    with ThreadPoolExecutor(10) as pool:
+        statuses = [f.result() for f in [pool.submit(redeem) for _ in range(10)]]
+
+    assert sorted(statuses) == [200] * 3 + [400] * 7
+    db.expire_all()
+    balance = ledger.get_balance(db, child_id)
+    assert balance.balance == 100
+    assert balance.lifetime_xp == 1000
+
+
+def test_concurrent_stats_backfill(family, db):
+    child_id = family.children[0]["id"]
+    start = threading.Barrier(8)
+
+    def load():
+        session = SessionLocal()
+        try:
+            start.wait()
+            stats.get_stats(session, child_id)
+            session.commit()
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(8) as pool:
+        for future in [pool.submit(load) for _ in range(8)]:
+            future.result()
+    assert db.get(models.ChildStats, child_id).faith_approved == 0
+
+
+def test_concurrent_writes_across_children(make_family, db):
+    # Earns, spends and multi-child batches for four children at once; each child earns a
+    # different amount, so a write applied to the wrong child shows up in its balance
+    children = [child["id"] for child in make_family(children=4).children]
+    for child_id in children:
+        ledger.add_entry(db, child_id, 1000, "TASK_APPROVED")
+    db.commit()
+
+    jobs = []
+    for i, child_id in enumerate(children):
+        jobs += [lambda s, c=child_id, p=(i + 1) * 10: ledger.add_entry(s, c, p, "TASK_APPROVED")] * 5
+        jobs += [lambda s, c=child_id: ledger.spend(s, c, 100, "Reward Redemption: test")] * 5
+    jobs += [lambda s: ledger.add_entries(s, [{"child_id": c, "delta_points": 1, "reason": "Bonus"} for c in children])] * 3
+    start = threading.Barrier(len(jobs))
+
+    def run(job):
+        session = SessionLocal()
+        try:
+            start.wait()
+            job(session)
+            session.commit()
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(len(jobs)) as pool:
+        for future in [pool.submit(run, job) for job in jobs]:
+            future.result()
+
+    db.expire_all()
+    for i, child_id in enumerate(children):
+        earned = 1000 + 5 * (i + 1) * 10 + 3
+        balance = ledger.get_balance(db, child_id)
+        assert (balance.balance, balance.lifetime_xp) == (earned - 500, earned), child_id
+        month = ledger.get_month(db, child_id)
+        assert (month.earned, month.spent) == (earned, 500), child_id
+        entries = db.query(models.PointsLedger.delta_points).filter(models.PointsLedger.child_id == child_id).all()
+        assert sum(delta for (delta,) in entries) == balance.balance
@@ -0,0 +1,78 @@
+"""LRUCache, behind the principal and family-context caches: hit rate, TTLs, eviction order and
+the generation check that keeps a racing load from storing what an invalidation dropped."""
+import pytest
+from app.core import lru
+from app.core.lru import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lru, "time", clock)
+    return clock
+
+
+def test_hits_misses_and_hit_rate():
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    assert cache.get(1) is None
+    cache.put(1, "one", cache.generation)
+    assert [cache.get(1) for _ in range(3)] == ["one"] * 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (3, 1, 0.75)
+
+
+def test_entries_expire(clock):
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    cache.put(1, "one", cache.generation)
+    clock.now += 59
+    assert cache.get(1) == "one"
+    # A hit doesn't extend the TTL
+    clock.now += 2
+    assert cache.get(1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_evicts_least_recently_used_first():
+    cache = LRUCache(maxsize=3, ttl_seconds=60)
+    for key in (1, 2, 3):
+        cache.put(key, str(key), cache.generation)
+    cache.get(1)
+    cache.put(4, "4", cache.generation)
+    cache.put(5, "5", cache.generation)
+    assert [cache.get(key) for key in (1, 2, 3, 4, 5)] == ["1", None, None, "4", "5"]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_invalidate_one_or_all():
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    for key in (1, 2, 3):
+        cache.put(key, str(key), cache.generation)
+    cache.invalidate(2)
+    assert [cache.get(key) for key in (1, 2, 3)] == ["1", None, "3"]
+    cache.invalidate()
+    assert [cache.get(key) for key in (1, 2, 3)] == [None] * 3
+
+
+def test_load_that_raced_an_invalidation_is_not_stored():
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    generation = cache.generation
+    # ... the loader reads the database, then a write invalidates the key ...
+    cache.invalidate(1)
+    cache.put(1, "stale", generation)
+    assert cache.get(1) is None
+    cache.put(1, "fresh", cache.generation)
+    assert cache.get(1) == "fresh"
+
+
+def test_zero_size_disables_the_cache():
+    cache = LRUCache(maxsize=0, ttl_seconds=60)
+    cache.put(1, "one", cache.generation)
+    assert cache.get(1) is None
@@ -0,0 +1,33 @@
+import pytest
+
+
+def _walk(client, url, headers, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = client.get(url, params=params, headers=headers).json()
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_tasks_walk_every_page_in_order(client, family):
+    created = [
+        client.post("/api/v1/tasks", json={"name": f"t{i}", "category": "HOME", "points": 10}, headers=family.parent_headers).json()["id"]
+        for i in range(7)
+    ]
+    items, pages = _walk(client, "/api/v1/tasks", family.parent_headers, limit=3)
+    assert [t["id"] for t in items] == created
+    assert pages == 3
+
+
+def test_single_page_has_null_cursor(client, family):
+    body = client.get("/api/v1/rewards/", headers=family.parent_headers).json()
+    assert body == {"items": [], "next_cursor": None}
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 10_000}, {"cursor": "not-a-cursor"}])
+def test_bad_page_parameters_are_rejected(client, family, params):
+    assert client.get("/api/v1/tasks", params=params, headers=family.parent_headers).status_code in (400, 422)
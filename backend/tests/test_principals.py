@@ -0,0 +1,86 @@
+"""The principal cache behind get_current_user: requests after the first are served from it,
+entries expire and are evicted, and a write that changes a user drops their cached principal."""
+from sqlalchemy import update
+from app.core import invalidation, lru
+from app.core.principals import principal_cache
+from app.models import models
+from conftest import ok
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def _me(client, headers):
+    return ok(client.get("/api/v1/users/me", headers=headers))
+
+
+def test_repeated_requests_hit_the_cache(client, family):
+    principal_cache.invalidate(family.parent["id"])
+    before = principal_cache.stats()
+    for _ in range(3):
+        _me(client, family.parent_headers)
+    after = principal_cache.stats()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 2)
+
+
+def test_expired_principal_is_reloaded(client, family, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lru, "time", clock)
+    user_id = family.parent["id"]
+    # Cached again on the fake clock
+    principal_cache.invalidate(user_id)
+    _me(client, family.parent_headers)
+    assert principal_cache.get(user_id) is not None
+
+    clock.now += principal_cache.ttl_seconds + 1
+    assert principal_cache.get(user_id) is None
+    _me(client, family.parent_headers)
+    assert principal_cache.get(user_id) is not None
+
+
+def test_eviction_keeps_requests_working(client, make_family, monkeypatch):
+    monkeypatch.setattr(principal_cache, "maxsize", 1)
+    principal_cache.invalidate()
+    first, second = make_family(0), make_family(0)
+    before = principal_cache.stats()["evictions"]
+    for _ in range(2):
+        assert _me(client, first.parent_headers)["id"] == first.parent["id"]
+        assert _me(client, second.parent_headers)["id"] == second.parent["id"]
+    # Each user pushes the other out: every request after the first evicts
+    assert principal_cache.stats()["size"] == 1
+    assert principal_cache.stats()["evictions"] - before == 3
+
+
+def test_role_change_drops_the_cached_principal(client, family, db):
+    child_id = family.children[0]["id"]
+    _me(client, family.child_headers[0])
+    assert principal_cache.get(child_id).role == models.RoleEnum.CHILD
+
+    db.execute(update(models.User).where(models.User.id == child_id).values(role=models.RoleEnum.PARENT))
+    invalidation.publish(db, family.parent["id"], "principal", child_id)
+    db.commit()
+    assert principal_cache.get(child_id) is None
+    _me(client, family.child_headers[0])
+    assert principal_cache.get(child_id).role == models.RoleEnum.PARENT
+
+
+def test_rolled_back_change_keeps_the_cached_principal(client, family, db):
+    child_id = family.children[0]["id"]
+    _me(client, family.child_headers[0])
+    db.execute(update(models.User).where(models.User.id == child_id).values(role=models.RoleEnum.PARENT))
+    invalidation.publish(db, family.parent["id"], "principal", child_id)
+    db.rollback()
+    assert principal_cache.get(child_id).role == models.RoleEnum.CHILD
+
+
+def test_deleted_child_is_locked_out_at_once(client, family):
+    child_id = family.children[0]["id"]
+    _me(client, family.child_headers[0])
+    ok(client.delete(f"/api/v1/children/{child_id}", headers=family.parent_headers))
+    assert principal_cache.get(child_id) is None
+    assert client.get("/api/v1/users/me", headers=family.child_headers[0]).status_code == 401
@@ -0,0 +1,49 @@
+"""Statements per request stay flat as lists grow (no N+1), checked with assert_max_queries."""
+import pytest
+from conftest import ok
+from app.db.query_count import assert_max_queries
+
+
+def _grow(client, family, n):
+    """Adds n of everything a list endpoint nests: submissions with evidence, read announcements, redemptions."""
+    parent, kid = family.parent_headers, family.child_headers[0]
+    task = ok(client.post("/api/v1/tasks", json={"name": "t", "category": "HOME", "points": 1}, headers=parent))
+    reward = ok(client.post("/api/v1/rewards/", json={"name": "r", "type": "GIFT", "cost_points": 1}, headers=parent))
+    for _ in range(n):
+        submission = ok(client.post("/api/v1/submissions", json={"task_id": task["id"], "evidence_files": ["a.png", "b.png"]}, headers=kid))
+        announcement = ok(client.post("/api/v1/announcements", json={"message": "m"}, headers=parent))
+        ok(client.post(f"/api/v1/announcements/{announcement['id']}/read", headers=kid))
+        ok(client.post("/api/v1/submissions/batch", json={"items": [{"id": submission["id"], "action": "approve"}]}, headers=parent))
+        ok(client.post("/api/v1/submissions", json={"task_id": task["id"], "evidence_files": ["c.png"]}, headers=kid))
+        ok(client.post(f"/api/v1/rewards/{reward['id']}/redeem", headers=kid))
+
+
+# (url, caller, statements); the version lookup for the ETag is one of them
+ENDPOINTS = [
+    ("/api/v1/tasks", "parent", 2),
+    ("/api/v1/rewards/", "child", 2),
+    ("/api/v1/rewards/redemptions/pending", "parent", 2),
+    ("/api/v1/announcements", "parent", 3),
+    ("/api/v1/announcements", "child", 4),
+    ("/api/v1/submissions/my", "child", 2),
+    ("/api/v1/submissions/pending", "parent", 3),
+    ("/api/v1/children", "parent", 1),
+    ("/api/v1/children/{child_id}/summary", "child", 6),
+]
+
+
+@pytest.mark.parametrize("url,who,limit", ENDPOINTS)
+def test_list_queries_stay_flat(client, make_family, url, who, limit):
+    family = make_family(children=1)
+    url = url.format(child_id=family.children[0]["id"])
+    headers = family.parent_headers if who == "parent" else family.child_headers[0]
+    # Loads the per-family caches (family context, first-use backfills), which only happens once
+    ok(client.get(url, headers=headers))
+
+    _grow(client, family, 1)
+    with assert_max_queries(limit) as small:
+        ok(client.get(url, headers=headers))
+    _grow(client, family, 5)
+    with assert_max_queries(limit) as large:
+        ok(client.get(url, headers=headers))
+    assert large.count == small.count
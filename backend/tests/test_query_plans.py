@@ -0,0 +1,91 @@
+"""EXPLAIN QUERY PLAN over the statements the hot endpoints actually run.
+
+Every SELECT issued while serving the requests below is captured with its bound parameters and
+explained against the migrated database. A step that scans a whole table instead of searching an
+index fails the test: it means a query changed shape or an index from alembic/versions went missing.
+"""
+import sqlite3
+import pytest
+from sqlalchemy import event
+from conftest import ok
+from app.db.session import async_engine, engine
+
+# Read whole by design: the badge catalog is a handful of rows, cached after the first load
+FULL_READS_ALLOWED = {"badges"}
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            captured.append((statement, parameters))
+
+    engines = (engine, async_engine.sync_engine)
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    yield captured
+    for e in engines:
+        event.remove(e, "before_cursor_execute", record)
+
+
+def _scans(db_path, statements):
+    conn = sqlite3.connect(db_path)
+    try:
+        scans = []
+        for statement, parameters in statements:
+            for step in (row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statement, parameters)):
+                if step.startswith("SCAN") and step.split()[1] not in FULL_READS_ALLOWED:
+                    scans.append((step, " ".join(statement.split())))
+        return scans
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def busy_family(client, make_family):
+    """A family with a little of everything: tasks, submissions with evidence, rewards, announcements."""
+    family = make_family(children=1)
+    parent, kid = family.parent_headers, family.child_headers[0]
+    task = ok(client.post("/api/v1/tasks", json={"name": "Pray", "category": "FAITH", "points": 500}, headers=parent))
+    family.submissions = [
+        ok(client.post("/api/v1/submissions", json={"task_id": task["id"], "evidence_files": ["a.png"]}, headers=kid)),
+        ok(client.post("/api/v1/submissions", json={"task_id": task["id"]}, headers=kid)),
+    ]
+    family.reward = ok(client.post("/api/v1/rewards/", json={"name": "Toy", "type": "GIFT", "cost_points": 100}, headers=parent))
+    announcement = ok(client.post("/api/v1/announcements", json={"message": "Hi"}, headers=parent))
+    ok(client.post(f"/api/v1/announcements/{announcement['id']}/read", headers=kid))
+    return family
+
+
+def test_hot_reads_search_indexes(client, migrated_db, busy_family, statements):
+    parent, kid = busy_family.parent_headers, busy_family.child_headers[0]
+    child_id = busy_family.children[0]["id"]
+    for url, headers in [
+        ("/api/v1/tasks", parent),
+        ("/api/v1/tasks?category=FAITH&active=true", kid),
+        ("/api/v1/rewards/", kid),
+        ("/api/v1/announcements", parent),
+        ("/api/v1/announcements", kid),
+        ("/api/v1/submissions/my", kid),
+        ("/api/v1/submissions/pending", parent),
+        ("/api/v1/children", parent),
+        (f"/api/v1/children/{child_id}/summary", kid),
+        (f"/api/v1/points/{child_id}", kid),
+        ("/api/v1/settings/", kid),
+    ]:
+        ok(client.get(url, headers=headers))
+    assert statements
+    assert _scans(migrated_db, statements) == []
+
+
+def test_hot_writes_search_indexes(client, migrated_db, busy_family, statements):
+    parent, kid = busy_family.parent_headers, busy_family.child_headers[0]
+    first, second = busy_family.submissions
+    ok(client.post(f"/api/v1/submissions/{first['id']}/approve", headers=parent))
+    ok(client.post("/api/v1/submissions/batch", json={"items": [{"id": second["id"], "action": "approve"}]}, headers=parent))
+    ok(client.post(f"/api/v1/rewards/{busy_family.reward['id']}/redeem", headers=kid))
+    ok(client.get("/api/v1/rewards/redemptions/pending", headers=parent))
+    assert statements
+    assert _scans(migrated_db, statements) == []
@@ -0,0 +1,91 @@
+"""The response cache on GET /api/v1/tasks, backed by a fresh MemoryCache per test: a miss stores
+the body, a hit replays it without running the endpoint, a write by the family moves the ETag
+and so the key, and the byte budget evicts the least recently used responses."""
+import pytest
+from app.core import response_cache as response_cache_module
+from app.core.cache import MemoryCache
+from app.db.session import SessionLocal
+from app.models import models
+
+URL = "/api/v1/tasks"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = MemoryCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    return cache
+
+
+def _add_task_behind_the_api(parent_id: int, name: str):
+    # Written outside a request, so the family version (and the ETag) stays put
+    with SessionLocal() as db:
+        db.add(models.Task(parent_id=parent_id, name=name, category=models.CategoryEnum.HOME, points=1, is_active=True))
+        db.commit()
+
+
+def _names(response) -> list:
+    assert response.status_code == 200, response.text
+    return [task["name"] for task in response.json()["items"]]
+
+
+def test_miss_stores_and_hit_replays(client, family, cache):
+    first = client.get(URL, headers=family.parent_headers)
+    assert _names(first) == []
+    assert (cache.stats()["misses"], cache.stats()["size"]) == (1, 1)
+
+    _add_task_behind_the_api(family.parent["id"], "unseen")
+    hit = client.get(URL, headers=family.parent_headers)
+    # Served from the cache: the endpoint didn't run, so the new row isn't there
+    assert _names(hit) == []
+    assert cache.stats()["hits"] == 1
+    assert hit.headers["content-type"] == first.headers["content-type"]
+    assert hit.headers["etag"] == first.headers["etag"]
+
+
+def test_callers_and_queries_are_cached_apart(client, family, cache):
+    client.get(URL, headers=family.parent_headers)
+    client.get(URL, headers=family.child_headers[0])
+    client.get(f"{URL}?category=HOME", headers=family.parent_headers)
+    assert (cache.stats()["misses"], cache.stats()["hits"], cache.stats()["size"]) == (3, 0, 3)
+
+
+def test_write_moves_the_key(client, family, cache):
+    client.get(URL, headers=family.parent_headers)
+    created = client.post(URL, json={"name": "new", "category": "HOME", "points": 5}, headers=family.parent_headers)
+    assert created.status_code == 200, created.text
+
+    after = client.get(URL, headers=family.parent_headers)
+    assert _names(after) == ["new"]
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (2, 0)
+    # The old entry is never asked for again and ages out
+    assert cache.stats()["size"] == 2
+
+
+def test_errors_are_not_cached(client, family, cache):
+    response = client.get(f"{URL}?cursor=not-a-cursor", headers=family.parent_headers)
+    assert response.status_code == 400
+    assert cache.stats()["size"] == 0
+
+
+def test_budget_evicts_least_recently_used(client, family, cache, monkeypatch):
+    client.get(URL, headers=family.parent_headers)
+    entry = cache.stats()["bytes"]
+    # Room for ten responses of about that size
+    small = MemoryCache(max_bytes=entry * 10 + entry // 2)
+    monkeypatch.setattr(response_cache_module, "response_cache", small)
+
+    urls = [f"{URL}?limit={n}" for n in range(10, 22)]
+    for url in urls[:10]:
+        client.get(url, headers=family.parent_headers)
+    client.get(urls[0], headers=family.parent_headers)  # a hit counts as use
+    for url in urls[10:]:
+        client.get(url, headers=family.parent_headers)
+    stats = small.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert (stats["size"], stats["evictions"], stats["hits"]) == (10, 2, 1)
+
+    # The two least recently used, urls[1] and urls[2], were evicted; urls[0] is still there
+    for url in (urls[0], urls[1], urls[2]):
+        client.get(url, headers=family.parent_headers)
+    assert small.stats()["hits"] == 2
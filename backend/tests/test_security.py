@@ -0,0 +1,56 @@
+"""Password hashing on the spawned process pool: hashes made there verify, and shutting the pool
+down stops its workers and leaves the next call to start a fresh one."""
+import asyncio
+import os
+import pytest
+from app.core import security
+
+
+@pytest.fixture
+def executor():
+    security.shutdown_hash_executor()
+    yield
+    security.shutdown_hash_executor()
+
+
+def _workers():
+    return list(security._hash_executor._processes.values())
+
+
+def test_hash_and_verify_on_the_pool(executor):
+    async def roundtrip():
+        hashed = await security.get_password_hash_async("s3cret")
+        return hashed, await security.verify_password_async("s3cret", hashed), await security.verify_password_async("wrong", hashed)
+
+    hashed, right, wrong = asyncio.run(roundtrip())
+    assert (right, wrong) == (True, False)
+    # Interchangeable with hashes made in this process
+    assert security.verify_password("s3cret", hashed)
+    assert asyncio.run(security.verify_password_async("pw", security.get_password_hash("pw")))
+
+    workers = _workers()
+    assert workers and all(p.pid != os.getpid() for p in workers)
+    assert security._hash_executor._mp_context.get_start_method() == "spawn"
+
+
+def test_batch_hashes_verify(executor):
+    hashes = security.get_password_hashes(["a", "b", "c"])
+    assert len(set(hashes)) == 3
+    assert [security.verify_password(p, h) for p, h in zip("abc", hashes)] == [True] * 3
+
+
+def test_shutdown_stops_the_workers(executor):
+    security.get_password_hashes(["warm"])
+    workers = _workers()
+
+    security.shutdown_hash_executor()
+    for process in workers:
+        process.join(timeout=10)
+    assert not any(process.is_alive() for process in workers)
+    assert all(process.exitcode == 0 for process in workers)
+    assert security._hash_executor is None
+
+    # Shutting down twice is harmless, and the next hash starts a new pool
+    security.shutdown_hash_executor()
+    assert security.verify_password("again", asyncio.run(security.get_password_hash_async("again")))
+    assert all(p not in workers for p in _workers())
@@ -0,0 +1,62 @@
+"""Engine setup and the per-request unit of work in app.db.session."""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core import invalidation
+from app.db.session import SessionRoute, get_async_db, get_db, split_budget
+from app.models import models
+
+
+@pytest.mark.parametrize("total,share,minimum,expected", [
+    (5, 0.7, 1, (4, 1)),
+    (10, 0.7, 0, (7, 3)),
+    (80, 0.5, 1, (40, 40)),
+    # Each engine keeps its minimum even when the share would leave it none
+    (5, 1.0, 1, (5, 1)),
+    (1, 0.7, 1, (1, 1)),
+    (0, 0.7, 0, (0, 0)),
+])
+def test_split_budget(total, share, minimum, expected):
+    assert split_budget(total, share, minimum) == expected
+
+
+@pytest.fixture
+def failing_client(migrated_db, monkeypatch):
+    """An app whose endpoints insert a task, publish an invalidation and then raise."""
+    calls = []
+    monkeypatch.setitem(invalidation._subscribers, "test", [lambda family_id, key: calls.append((family_id, key))])
+    router = APIRouter(route_class=SessionRoute)
+
+    def write(db, parent_id: int):
+        db.add(models.Task(parent_id=parent_id, name="never saved", category=models.CategoryEnum.HOME,
+                           points=1, description="d", is_active=True))
+        invalidation.publish(db, 1, "test")
+
+    @router.post("/sync/{parent_id}")
+    def sync_endpoint(parent_id: int, db: Session = Depends(get_db)):
+        write(db, parent_id)
+        db.flush()
+        raise RuntimeError("boom")
+
+    @router.post("/async/{parent_id}")
+    async def async_endpoint(parent_id: int, db: AsyncSession = Depends(get_async_db)):
+        write(db, parent_id)
+        await db.flush()
+        raise RuntimeError("boom")
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.invalidations = calls
+        yield client
+
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_endpoint_error_rolls_back_the_unit_of_work(failing_client, family, db, path):
+    response = failing_client.post(f"{path}/{family.parent['id']}")
+    assert response.status_code == 500
+    assert db.scalar(select(func.count()).select_from(models.Task).where(models.Task.name == "never saved")) == 0
+    assert failing_client.invalidations == []
@@ -0,0 +1,43 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from app import main
+from app.db import migrations
+from app.db.session import Base, engine
+
+
+def _must_not_run(*args, **kwargs):
+    raise AssertionError("startup must not build or seed the schema")
+
+
+def test_startup_only_reads_the_schema_revision_and_badge_catalog(migrated_db, monkeypatch):
+    monkeypatch.setattr(Base.metadata, "create_all", _must_not_run)
+    monkeypatch.setattr(main, "seed_data", _must_not_run)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", record)
+    client = TestClient(main.app)
+    try:
+        started = time.perf_counter()
+        client.__enter__()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        client.__exit__(None, None, None)
+
+    print(f"\nstartup took {elapsed * 1000:.1f}ms")
+    assert statements[0] == "SELECT version_num FROM alembic_version"
+    # The badge catalog, on a session of its own
+    assert statements[1:] == ["SELECT badges.code AS badges_code, badges.id AS badges_id FROM badges"]
+    assert elapsed < 1.0
+
+
+def test_startup_refuses_an_unmigrated_database(tmp_path):
+    empty = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    with pytest.raises(migrations.SchemaOutOfDate):
+        migrations.check_schema_revision(empty)
+    empty.dispose()
@@ -0,0 +1,67 @@
+"""POST /api/v1/submissions/batch: a batch is reviewed whole or not at all."""
+import pytest
+from sqlalchemy import func, select
+from conftest import ok
+from app.models import models
+
+BATCH = "/api/v1/submissions/batch"
+
+
+@pytest.fixture
+def submit(client):
+    def submit(family, points=10, child=0):
+        task = ok(client.post("/api/v1/tasks", json={"name": "t", "category": "HOME", "points": points}, headers=family.parent_headers))
+        return ok(client.post("/api/v1/submissions", json={"task_id": task["id"], "evidence_files": ["a.png"]},
+                              headers=family.child_headers[child]))["id"]
+    return submit
+
+
+def _review(client, family, *items):
+    return client.post(BATCH, json={"items": [{"id": i, "action": a} for i, a in items]}, headers=family.parent_headers)
+
+
+def _state(db, ids):
+    db.expire_all()
+    statuses = dict(db.execute(select(models.Submission.id, models.Submission.status).where(models.Submission.id.in_(ids))).all())
+    credited = db.scalar(select(func.count()).select_from(models.PointsLedger)
+                         .where(models.PointsLedger.related_submission_id.in_(ids)))
+    return [statuses[i] for i in ids], credited
+
+
+def test_batch_approves_and_rejects(client, family, db, submit):
+    a, b, c = submit(family, 10), submit(family, 20), submit(family, 30)
+    result = ok(_review(client, family, (c, "approve"), (a, "approve"), (b, "reject")))
+    assert result == {"approved": [a, c], "rejected": [b]}
+    P, R = models.SubmissionStatus.APPROVED, models.SubmissionStatus.REJECTED
+    assert _state(db, [a, b, c]) == ([P, R, P], 2)
+    assert ok(client.get(f"/api/v1/points/{family.children[0]['id']}", headers=family.parent_headers))["totalPoints"] == 40
+
+
+def test_already_reviewed_items_conflict(client, family, db, submit):
+    reviewed, pending = submit(family), submit(family)
+    ok(_review(client, family, (reviewed, "approve")))
+
+    response = _review(client, family, (pending, "approve"), (reviewed, "approve"))
+    assert response.status_code == 409
+    assert str(reviewed) in response.json()["detail"]
+    # Nothing from the rejected batch was applied: the pending one is untouched and paid nothing
+    assert _state(db, [reviewed, pending]) == ([models.SubmissionStatus.APPROVED, models.SubmissionStatus.PENDING], 1)
+
+
+def test_duplicate_ids_are_rejected(client, family, db, submit):
+    sub = submit(family)
+    response = _review(client, family, (sub, "approve"), (sub, "approve"))
+    assert response.status_code == 400
+    response = _review(client, family, (sub, "approve"), (sub, "reject"))
+    assert response.status_code == 400
+    assert _state(db, [sub]) == ([models.SubmissionStatus.PENDING], 0)
+
+
+def test_other_familys_items_are_not_found(client, make_family, db, submit):
+    mine, theirs = make_family(), make_family()
+    own, foreign = submit(mine), submit(theirs)
+
+    response = _review(client, mine, (own, "approve"), (foreign, "approve"))
+    assert response.status_code == 404
+    assert str(foreign) in response.json()["detail"]
+    assert _state(db, [own, foreign]) == ([models.SubmissionStatus.PENDING] * 2, 0)
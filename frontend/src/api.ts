@@ -17,6 +17,15 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// List endpoints return one page at a time ({ items, next_cursor }); pass next_cursor back to get
+// the page after it. Screens show the first page and fetch more on demand (components/LoadMore)
+export interface Page<T = any> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+const getPage = (url: string) => (cursor?: string) => api.get<Page>(url, { params: { cursor } });
+
 // Auth
 export const login = (formData: any) => api.post('/api/v1/auth/login', formData);
 export const registerParent = (data: any) => api.post('/api/v1/auth/register-parent', data);
@@ -24,14 +33,14 @@ export const getMe = () => api.get('/api/v1/users/me');
 
 // Children (Parent)
 export const createChild = (data: any) => api.post('/api/v1/children', data);
-export const listChildren = () => api.get('/api/v1/children');
+export const listChildren = getPage('/api/v1/children');
 export const getChildSummary = (id: number) => api.get(`/api/v1/children/${id}/summary`);
 export const getChild = (id: number) => api.get(`/api/v1/children/${id}`);
 export const deleteChild = (id: number) => api.delete(`/api/v1/children/${id}`);
 
 // Tasks
 export const createTask = (data: any) => api.post('/api/v1/tasks', data);
-export const listTasks = () => api.get('/api/v1/tasks');
+export const listTasks = getPage('/api/v1/tasks');
 export const deleteTask = (id: number) => api.delete(`/api/v1/tasks/${id}`);
 
 // Uploads
@@ -47,8 +56,8 @@ export const uploadFile = (file: File) => {
 
 // Submissions
 export const submitTask = (data: any) => api.post('/api/v1/submissions', data);
-export const getMySubmissions = () => api.get('/api/v1/submissions/my');
-export const getPendingSubmissions = () => api.get('/api/v1/submissions/pending');
+export const getMySubmissions = getPage('/api/v1/submissions/my');
+export const getPendingSubmissions = getPage('/api/v1/submissions/pending');
 export const approveSubmission = (id: number) => api.post(`/api/v1/submissions/${id}/approve`);
 export const rejectSubmission = (id: number) => api.post(`/api/v1/submissions/${id}/reject`);
 
@@ -58,16 +67,16 @@ export const updateSettings = (data: any) => api.put('/api/v1/settings', data);
 
 // Rewards
 export const createReward = (data: any) => api.post('/api/v1/rewards', data);
-export const listRewards = () => api.get('/api/v1/rewards');
+export const listRewards = getPage('/api/v1/rewards');
 export const deleteReward = (id: number) => api.delete(`/api/v1/rewards/${id}`);
 export const redeemReward = (id: number) => api.post(`/api/v1/rewards/${id}/redeem`);
-export const getPendingRedemptions = () => api.get('/api/v1/rewards/redemptions/pending');
+export const getPendingRedemptions = getPage('/api/v1/rewards/redemptions/pending');
 export const approveRedemption = (id: number) => api.post(`/api/v1/rewards/redemptions/${id}/approve`);
 export const rejectRedemption = (id: number) => api.post(`/api/v1/rewards/redemptions/${id}/reject`);
 
 // Announcements
 export const createAnnouncement = (data: { message: string }) => api.post('/api/v1/announcements', data);
-export const listAnnouncements = () => api.get('/api/v1/announcements');
+export const listAnnouncements = getPage('/api/v1/announcements');
 export const markAnnouncementRead = (id: number) => api.post(`/api/v1/announcements/${id}/read`);
 export const deleteAnnouncement = (id: number) => api.delete(`/api/v1/announcements/${id}`);
 
@@ -0,0 +1,52 @@
+import React, { useRef, useState } from 'react';
+import { Box, Button } from '@mui/material';
+import { AxiosResponse } from 'axios';
+import { Page } from '../api';
+
+type FetchPage = (cursor?: string) => Promise<AxiosResponse<Page>>;
+
+// One paginated list: reload() shows the first page again, loadMore() appends the next one
+export function usePagedList(fetchPage: FetchPage) {
+    const [items, setItems] = useState<any[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loading, setLoading] = useState(false);
+    // Bumped by reload, so a page still in flight from before it is dropped
+    const generation = useRef(0);
+
+    const reload = async () => {
+        const current = ++generation.current;
+        const res = await fetchPage();
+        if (current !== generation.current) return;
+        setItems(res.data.items);
+        setNextCursor(res.data.next_cursor);
+    };
+
+    const loadMore = async () => {
+        if (!nextCursor || loading) return;
+        const current = generation.current;
+        setLoading(true);
+        try {
+            const res = await fetchPage(nextCursor);
+            if (current !== generation.current) return;
+            setItems(prev => [...prev, ...res.data.items]);
+            setNextCursor(res.data.next_cursor);
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    return { items, nextCursor, loading, reload, loadMore };
+}
+
+export type PagedList = ReturnType<typeof usePagedList>;
+
+export default function LoadMore({ list }: { list: PagedList }) {
+    if (!list.nextCursor) return null;
+    return (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+            <Button variant="outlined" onClick={list.loadMore} disabled={list.loading}>
+                {list.loading ? 'Loading...' : 'Load more'}
+            </Button>
+        </Box>
+    );
+}
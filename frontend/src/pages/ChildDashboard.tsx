@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Box, Typography, Grid, Paper, Card, CardContent, Button, Dialog, DialogTitle, DialogContent, TextField, Chip, LinearProgress, Alert, Badge, List, ListItem, ListItemButton, ListItemText, ListItemIcon, Divider } from '@mui/material';
 import { useAuth } from '../contexts/AuthContext';
-import { getChildSummary, listTasks, submitTask, listRewards, redeemReward, getMySubmissions, uploadFile, listAnnouncements, markAnnouncementRead, deleteAnnouncement } from '../api';
+import { getChildSummary, listTasks, submitTask, listRewards, redeemReward, uploadFile, listAnnouncements, markAnnouncementRead, deleteAnnouncement } from '../api';
 import StarIcon from '@mui/icons-material/Star';
 import EmojiEventsIcon from '@mui/icons-material/EmojiEvents';
 import LocalFireDepartmentIcon from '@mui/icons-material/LocalFireDepartment';
@@ -10,14 +10,14 @@ import CameraAltIcon from '@mui/icons-material/CameraAlt';
 import PhotoLibraryIcon from '@mui/icons-material/PhotoLibrary';
 import AttachFileIcon from '@mui/icons-material/AttachFile';
 import CampaignIcon from '@mui/icons-material/Campaign';
+import LoadMore, { usePagedList } from '../components/LoadMore';
 
 export default function ChildDashboard() {
     const { user } = useAuth();
     const [summary, setSummary] = useState<any>(null);
-    const [tasks, setTasks] = useState<any[]>([]);
-    const [rewards, setRewards] = useState<any[]>([]);
-    const [mySubs, setMySubs] = useState<any[]>([]);
-    const [announcements, setAnnouncements] = useState<any[]>([]);
+    const tasks = usePagedList(listTasks);
+    const rewards = usePagedList(listRewards);
+    const announcements = usePagedList(listAnnouncements);
 
     const [openSubmit, setOpenSubmit] = useState(false);
 
@@ -37,14 +37,9 @@ export default function ChildDashboard() {
             try {
                 const sum = await getChildSummary(user.id);
                 setSummary(sum.data);
-                const t = await listTasks();
-                setTasks(t.data.filter((x: any) => x.is_active));
-                const r = await listRewards();
-                setRewards(r.data.filter((x: any) => x.is_active));
-                const s = await getMySubmissions();
-                setMySubs(s.data);
-                const a = await listAnnouncements();
-                setAnnouncements(a.data);
+                await tasks.reload();
+                await rewards.reload();
+                await announcements.reload();
             } catch (e) { console.error(e); }
         }
     };
@@ -206,13 +201,13 @@ export default function ChildDashboard() {
             </Paper>
 
             {/* ANNOUNCEMENTS */}
-            {announcements.length > 0 && (
+            {announcements.items.length > 0 && (
                 <Paper sx={{ p: 2, mb: 3, bgcolor: '#fff3e0' }}>
                     <Box sx={{ display: 'flex', alignItems: 'center', mb: 2 }}>
                         <CampaignIcon sx={{ mr: 1, color: '#ff9800' }} />
                         <Typography variant="h6" sx={{ fontWeight: 'bold' }}>Messages from Parents</Typography>
                     </Box>
-                    {announcements.map((a: any) => (
+                    {announcements.items.map((a: any) => (
                         <Paper
                             key={a.id}
                             sx={{
@@ -255,6 +250,7 @@ export default function ChildDashboard() {
                             </Box>
                         </Paper>
                     ))}
+                    <LoadMore list={announcements} />
                 </Paper>
             )}
 
@@ -263,7 +259,7 @@ export default function ChildDashboard() {
                 <Grid item xs={12} md={8}>
                     <Typography variant="h5" sx={{ mb: 2, fontWeight: 'bold' }}>Available Tasks</Typography>
                     <Grid container spacing={2}>
-                        {tasks.map((t: any) => (
+                        {tasks.items.filter((t: any) => t.is_active).map((t: any) => (
                             <Grid item xs={12} sm={6} key={t.id}>
                                 <Card variant="outlined" sx={{ height: '100%', display: 'flex', flexDirection: 'column' }}>
                                     <CardContent sx={{ flexGrow: 1 }}>
@@ -281,12 +277,13 @@ export default function ChildDashboard() {
                             </Grid>
                         ))}
                     </Grid>
+                    <LoadMore list={tasks} />
                 </Grid>
 
                 {/* SIDEBAR: REWARDS & BADGES */}
                 <Grid item xs={12} md={4}>
                     <Typography variant="h5" sx={{ mb: 2, fontWeight: 'bold' }}>Rewards Store</Typography>
-                    {rewards.map((r: any) => (
+                    {rewards.items.filter((r: any) => r.is_active).map((r: any) => (
                         <Card key={r.id} sx={{ mb: 2 }}>
                             <CardContent>
                                 <Box sx={{ display: 'flex', justifyContent: 'space-between' }}>
@@ -306,6 +303,7 @@ export default function ChildDashboard() {
                             </CardContent>
                         </Card>
                     ))}
+                    <LoadMore list={rewards} />
 
                     <Typography variant="h5" sx={{ mb: 2, mt: 4, fontWeight: 'bold' }}>My Badges</Typography>
                     <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 1 }}>
@@ -8,6 +8,7 @@ import DeleteIcon from '@mui/icons-material/Delete';
 import CampaignIcon from '@mui/icons-material/Campaign';
 import AttachFileIcon from '@mui/icons-material/AttachFile';
 import { IconButton } from '@mui/material';
+import LoadMore, { usePagedList } from '../components/LoadMore';
 
 function TabPanel(props: any) {
   const { children, value, index, ...other } = props;
@@ -32,12 +33,12 @@ const TASK_TEMPLATES = [
 
 export default function ParentDashboard() {
   const [tab, setTab] = useState(0);
-  const [childrenList, setChildrenList] = useState<any[]>([]);
-  const [tasks, setTasks] = useState<any[]>([]);
-  const [rewards, setRewards] = useState<any[]>([]);
-  const [pendingSubs, setPendingSubs] = useState<any[]>([]);
-  const [pendingRedemptions, setPendingRedemptions] = useState<any[]>([]);
-  const [announcements, setAnnouncements] = useState<any[]>([]);
+  const childrenList = usePagedList(listChildren);
+  const tasks = usePagedList(listTasks);
+  const rewards = usePagedList(listRewards);
+  const pendingSubs = usePagedList(getPendingSubmissions);
+  const pendingRedemptions = usePagedList(getPendingRedemptions);
+  const announcements = usePagedList(listAnnouncements);
   const [openChildDialog, setOpenChildDialog] = useState(false);
   const [openTaskDialog, setOpenTaskDialog] = useState(false);
   const [openRewardDialog, setOpenRewardDialog] = useState(false);
@@ -52,18 +53,18 @@ export default function ParentDashboard() {
   const fetchData = async () => {
     try {
       if (tab === 0) { // Overview / Submissions
-        const s = await getPendingSubmissions(); setPendingSubs(s.data);
-        const r = await getPendingRedemptions(); setPendingRedemptions(r.data);
-        const c = await listChildren(); setChildrenList(c.data);
+        await pendingSubs.reload();
+        await pendingRedemptions.reload();
+        await childrenList.reload();
       } else if (tab === 1) { // Children
-        const c = await listChildren(); setChildrenList(c.data);
+        await childrenList.reload();
       } else if (tab === 2) { // Tasks
-        const t = await listTasks(); setTasks(t.data);
+        await tasks.reload();
       } else if (tab === 3) { // Rewards
-        const r = await listRewards(); setRewards(r.data);
+        await rewards.reload();
       } else if (tab === 4) { // Announcements
-        const a = await listAnnouncements(); setAnnouncements(a.data);
-        const c = await listChildren(); setChildrenList(c.data); // Need children to map names
+        await announcements.reload();
+        await childrenList.reload(); // Need children to map names
       }
     } catch (e) { console.error(e); }
   };
@@ -162,7 +163,7 @@ export default function ParentDashboard() {
           <Grid xs={12}>
             <Typography variant="h6" gutterBottom>Children Status</Typography>
             <Grid container spacing={2}>
-              {childrenList.map((c: any) => (
+              {childrenList.items.map((c: any) => (
                 <Grid xs={12} sm={4} key={c.id}>
                   <Card variant="outlined">
                     <CardContent>
@@ -173,14 +174,15 @@ export default function ParentDashboard() {
                 </Grid>
               ))}
             </Grid>
+            <LoadMore list={childrenList} />
           </Grid>
 
           {/* Pending Submissions */}
           <Grid xs={12} md={6}>
             <Typography variant="h6" gutterBottom>Pending Tasks</Typography>
-            {pendingSubs.length === 0 ? <Typography color="textSecondary">No pending submissions.</Typography> : (
+            {pendingSubs.items.length === 0 ? <Typography color="textSecondary">No pending submissions.</Typography> : (
               <List>
-                {pendingSubs.map((s: any) => (
+                {pendingSubs.items.map((s: any) => (
                   <Paper key={s.id} sx={{ mb: 2, p: 2 }} variant="outlined">
                     <Typography variant="subtitle2">Task ID: {s.task_id}</Typography>
                     {s.note && <Typography variant="body2">Note: {s.note}</Typography>}
@@ -222,14 +224,15 @@ export default function ParentDashboard() {
                 ))}
               </List>
             )}
+            <LoadMore list={pendingSubs} />
           </Grid>
 
           {/* Pending Rewards */}
           <Grid xs={12} md={6}>
             <Typography variant="h6" gutterBottom>Reward Requests</Typography>
-            {pendingRedemptions.length === 0 ? <Typography color="textSecondary">No pending requests.</Typography> : (
+            {pendingRedemptions.items.length === 0 ? <Typography color="textSecondary">No pending requests.</Typography> : (
               <List>
-                {pendingRedemptions.map((r: any) => (
+                {pendingRedemptions.items.map((r: any) => (
                   <Paper key={r.id} sx={{ mb: 2, p: 2 }} variant="outlined">
                     <Typography variant="subtitle2">Reward: {r.reward.name} ({r.cost_points_at_time} pts)</Typography>
                     <Box sx={{ mt: 1 }}>
@@ -240,6 +243,7 @@ export default function ParentDashboard() {
                 ))}
               </List>
             )}
+            <LoadMore list={pendingRedemptions} />
           </Grid>
         </Grid>
       </TabPanel>
@@ -248,7 +252,7 @@ export default function ParentDashboard() {
       <TabPanel value={tab} index={1}>
         <Button startIcon={<AddIcon />} variant="contained" onClick={() => setOpenChildDialog(true)} sx={{ mb: 2 }}>Add Child</Button>
         <Grid container spacing={2}>
-          {childrenList.map((c: any) => (
+          {childrenList.items.map((c: any) => (
             <Grid xs={12} sm={6} md={4} key={c.id}>
               <Card>
                 <CardContent>
@@ -263,6 +267,7 @@ export default function ParentDashboard() {
             </Grid>
           ))}
         </Grid>
+        <LoadMore list={childrenList} />
         <Dialog open={openChildDialog} onClose={() => setOpenChildDialog(false)}>
           <DialogTitle>Add New Child</DialogTitle>
           <DialogContent>
@@ -293,7 +298,7 @@ export default function ParentDashboard() {
         </Box>
         <Button startIcon={<AddIcon />} variant="contained" onClick={() => setOpenTaskDialog(true)} sx={{ mb: 2 }}>Create Custom Task</Button>
         <Grid container spacing={2}>
-          {tasks.map((t: any) => (
+          {tasks.items.map((t: any) => (
             <Grid xs={12} sm={6} key={t.id}>
               <Card>
                 <CardContent>
@@ -311,6 +316,7 @@ export default function ParentDashboard() {
             </Grid>
           ))}
         </Grid>
+        <LoadMore list={tasks} />
         <Dialog open={openTaskDialog} onClose={() => setOpenTaskDialog(false)}>
           <DialogTitle>Create New Task</DialogTitle>
           <DialogContent>
@@ -332,7 +338,7 @@ export default function ParentDashboard() {
       <TabPanel value={tab} index={3}>
         <Button startIcon={<AddIcon />} variant="contained" onClick={() => setOpenRewardDialog(true)} sx={{ mb: 2 }}>Create Reward</Button>
         <Grid container spacing={2}>
-          {rewards.map((r: any) => (
+          {rewards.items.map((r: any) => (
             <Grid xs={12} sm={6} md={4} key={r.id}>
               <Card>
                 <CardContent>
@@ -350,6 +356,7 @@ export default function ParentDashboard() {
             </Grid>
           ))}
         </Grid>
+        <LoadMore list={rewards} />
         <Dialog open={openRewardDialog} onClose={() => setOpenRewardDialog(false)}>
           <DialogTitle>Create Reward</DialogTitle>
           <DialogContent>
@@ -395,7 +402,7 @@ export default function ParentDashboard() {
           </Paper>
 
           <List>
-            {announcements.map((a: any) => (
+            {announcements.items.map((a: any) => (
               <Paper key={a.id} sx={{ mb: 2 }} variant="outlined">
                 <ListItem>
                   <ListItemText
@@ -420,7 +427,7 @@ export default function ParentDashboard() {
                     <Typography variant="caption" color="textSecondary">Seen by:</Typography>
                     <Box sx={{ display: 'flex', gap: 1, mt: 0.5 }}>
                       {a.reads.map((r: any) => {
-                        const child = childrenList.find((c: any) => c.id === r.child_id);
+                        const child = childrenList.items.find((c: any) => c.id === r.child_id);
                         return (
                           <Chip
                             key={r.child_id}
@@ -443,6 +450,7 @@ export default function ParentDashboard() {
               </Paper>
             ))}
           </List>
+          <LoadMore list={announcements} />
         </Box>
       </TabPanel>
       <Dialog open={!!viewEvidence} onClose={() => setViewEvidence(null)} maxWidth="md" fullWidth>